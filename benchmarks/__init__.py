@@ -0,0 +1 @@
+"""Benchmarks for the go2rtc client."""
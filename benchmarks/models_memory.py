@@ -0,0 +1,77 @@
+"""Benchmark the memory footprint of the stream models.
+
+Compares the slot based models with equivalent plain dataclasses for an
+in-memory mirror of 10k streams.
+
+Run with: uv run python -m benchmarks.models_memory
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from go2rtc_client.models import Producer, Stream
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+STREAMS = 10_000
+PRODUCERS = 2
+
+
+@dataclass
+class DictProducer:
+    """Producer model with a per-instance __dict__."""
+
+    url: str
+
+
+@dataclass
+class DictStream:
+    """Stream model with a per-instance __dict__."""
+
+    producers: list[DictProducer]
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """Return the bytes allocated by build."""
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    result = build()
+    allocated = sum(
+        stat.size_diff
+        for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    )
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def main() -> None:
+    """Run the benchmark."""
+    # Share the url strings, so only the model overhead is measured
+    urls = [
+        [f"rtsp://192.168.{index // 250}.{index % 250}/{p}" for p in range(PRODUCERS)]
+        for index in range(STREAMS)
+    ]
+
+    def build_slots() -> list[Stream]:
+        return [Stream([Producer(url) for url in stream]) for stream in urls]
+
+    def build_dict() -> list[DictStream]:
+        return [DictStream([DictProducer(url) for url in stream]) for stream in urls]
+
+    results = {
+        "plain dataclasses": measure(build_dict),
+        "slot based models": measure(build_slots),
+    }
+    baseline = results["plain dataclasses"]
+    print(f"Memory for {STREAMS} streams with {PRODUCERS} producers each:")
+    for name, allocated in results.items():
+        print(f"  {name:<18} {allocated / 1024:8.0f} KiB  {allocated / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
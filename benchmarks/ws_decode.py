@@ -0,0 +1,67 @@
+"""Benchmark decoding the received websocket messages.
+
+Compares the previous path, which decoded every message with the discriminator
+of BaseMessage and unwrapped the WebRTC message afterwards, with the lookup
+table of decode_message.
+
+Run with: uv run python -m benchmarks.ws_decode
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from go2rtc_client.ws.messages import BaseMessage, WebRTC, WsMessage, decode_message
+
+NUMBER = 10_000
+ROUNDS = 5
+MESSAGES = {
+    "candidate": (
+        '{"value":"candidate:1 1 udp 2130706431 192.168.1.10 53114 typ host",'
+        '"type":"webrtc/candidate"}'
+    ),
+    "answer": (
+        '{"value":{"type":"answer","sdp":"'
+        + "v=0\\r\\no=- 1 1 IN IP4 0.0.0.0\\r\\n" * 20
+        + '"},"type":"webrtc"}'
+    ),
+    "error": '{"value":"stream not found","type":"error"}',
+}
+
+
+def discriminator_path(data: str) -> WsMessage:
+    """Decode a message like the client did before."""
+    message: WsMessage = BaseMessage.from_json(data)
+    if isinstance(message, WebRTC):
+        message = message.value
+    return message
+
+
+def main() -> None:
+    """Run the benchmark."""
+    print(f"Decoding {NUMBER} messages per type, best of {ROUNDS} rounds:")
+    for name, data in MESSAGES.items():
+        assert discriminator_path(data) == decode_message(data)
+        baseline = min(
+            timeit.repeat(
+                lambda data=data: discriminator_path(data),  # type: ignore[misc]
+                number=NUMBER,
+                repeat=ROUNDS,
+            )
+        )
+        fast = min(
+            timeit.repeat(
+                lambda data=data: decode_message(data),  # type: ignore[misc]
+                number=NUMBER,
+                repeat=ROUNDS,
+            )
+        )
+        print(
+            f"  {name:<10} discriminator {baseline / NUMBER * 1e6:6.2f} us"
+            f"  lookup table {fast / NUMBER * 1e6:6.2f} us"
+            f"  {baseline / fast:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
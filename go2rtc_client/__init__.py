@@ -1,7 +1,64 @@
 """go2rtc client."""
 
 from . import ws
-from .models import Stream, WebRTCSdpAnswer, WebRTCSdpOffer
+from .bulk import BulkResult
+from .cache import CacheStats, SnapshotCache
+from .models import (
+    LazyStreams,
+    PreloadConfig,
+    SnapshotRequest,
+    Stream,
+    WebRTCSdpAnswer,
+    WebRTCSdpOffer,
+)
+from .policies import (
+    BackoffPolicy,
+    CircuitBreaker,
+    CircuitState,
+    ConnectionPolicy,
+    RetryBudget,
+    RetryPolicy,
+    TimeoutPolicy,
+)
+from .reconcile import (
+    ActionKind,
+    DesiredState,
+    ReconcileAction,
+    Reconciler,
+    ReconcileResult,
+)
+from .registry import StreamChange, StreamRegistry, StreamsDiff
 from .rest import Go2RtcRestClient
+from .scheduler import EvictionPolicy, PreloadScheduler, ScheduleResult
 
-__all__ = ["Go2RtcRestClient", "Stream", "WebRTCSdpAnswer", "WebRTCSdpOffer", "ws"]
+__all__ = [
+    "ActionKind",
+    "BackoffPolicy",
+    "BulkResult",
+    "CacheStats",
+    "CircuitBreaker",
+    "CircuitState",
+    "ConnectionPolicy",
+    "DesiredState",
+    "EvictionPolicy",
+    "Go2RtcRestClient",
+    "LazyStreams",
+    "PreloadConfig",
+    "PreloadScheduler",
+    "ReconcileAction",
+    "ReconcileResult",
+    "Reconciler",
+    "RetryBudget",
+    "RetryPolicy",
+    "ScheduleResult",
+    "SnapshotCache",
+    "SnapshotRequest",
+    "Stream",
+    "StreamChange",
+    "StreamRegistry",
+    "StreamsDiff",
+    "TimeoutPolicy",
+    "WebRTCSdpAnswer",
+    "WebRTCSdpOffer",
+    "ws",
+]
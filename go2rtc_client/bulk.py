@@ -0,0 +1,70 @@
+"""Helpers for bulk operations."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class BulkResult[K, V]:
+    """Result of a single item of a bulk operation."""
+
+    key: K
+    value: V | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return if the item succeeded."""
+        return self.error is None
+
+
+async def bounded_as_completed[K, V](
+    keys: Iterable[K],
+    func: Callable[[K], Awaitable[V]],
+    *,
+    concurrency: int,
+    item_timeout: float | None = None,
+) -> AsyncGenerator[BulkResult[K, V], None]:
+    """Run func for each key with bounded concurrency.
+
+    Results are yielded as they complete. An error or timeout of a single key
+    is reported in its result and does not stop the other keys.
+    """
+    if concurrency < 1:
+        msg = "Concurrency must be at least 1"
+        raise ValueError(msg)
+
+    async def _run(key: K) -> V:
+        async with asyncio.timeout(item_timeout):
+            return await func(key)
+
+    iterator = iter(keys)
+    pending: dict[asyncio.Task[V], K] = {}
+
+    def _start(count: int) -> None:
+        for key in islice(iterator, count):
+            pending[asyncio.create_task(_run(key))] = key
+
+    try:
+        _start(concurrency)
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            _start(len(done))
+            for task in done:
+                key = pending.pop(task)
+                result: BulkResult[K, V]
+                try:
+                    result = BulkResult(key, value=task.result())
+                except Exception as err:  # noqa: BLE001 # pylint: disable=broad-except
+                    result = BulkResult(key, error=err)
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,99 @@
+"""Caches for the go2rtc client."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+type SnapshotKey = tuple[str, int | None, int | None]
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Cache statistics."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+
+class SnapshotCache:
+    """Snapshot cache with TTL, LRU eviction and request coalescing.
+
+    Concurrent lookups of a missing key await a single fetch.
+    """
+
+    def __init__(self, *, ttl: float = 1.0, max_entries: int = 128) -> None:
+        """Initialize cache."""
+        if ttl <= 0:
+            msg = "TTL must be greater than 0"
+            raise ValueError(msg)
+        if max_entries < 1:
+            msg = "Max entries must be at least 1"
+            raise ValueError(msg)
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[SnapshotKey, tuple[float, bytes]] = OrderedDict()
+        self._in_flight: dict[SnapshotKey, asyncio.Task[bytes]] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Return the number of cached snapshots."""
+        return len(self._entries)
+
+    async def get(
+        self, key: SnapshotKey, fetch: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Return the cached snapshot or fetch it."""
+        if (entry := self._entries.get(key)) is not None:
+            expires, image = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return image
+            del self._entries[key]
+
+        if (task := self._in_flight.get(key)) is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.create_task(self._fetch(key, fetch))
+            task.add_done_callback(_retrieve_exception)
+            self._in_flight[key] = task
+        # Shield the fetch, so a cancelled caller does not cancel the others
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: SnapshotKey) -> None:
+        """Remove a snapshot from the cache."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all snapshots from the cache."""
+        self._entries.clear()
+
+    async def _fetch(
+        self, key: SnapshotKey, fetch: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Fetch a snapshot and store it."""
+        try:
+            image = await fetch()
+        finally:
+            del self._in_flight[key]
+
+        self._entries[key] = (time.monotonic() + self._ttl, image)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return image
+
+
+def _retrieve_exception(task: asyncio.Task[Any]) -> None:
+    """Mark the exception as retrieved if all waiters were cancelled."""
+    if not task.cancelled():
+        task.exception()
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from contextlib import aclosing
 from functools import wraps
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 
 from aiohttp import ClientError
 from mashumaro.exceptions import (
@@ -14,15 +15,32 @@ from mashumaro.exceptions import (
     SuitableVariantNotFoundError,
     UnserializableDataError,
 )
+from orjson import JSONDecodeError
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Coroutine
+    from collections.abc import AsyncGenerator, Callable, Coroutine
 
 
 class Go2RtcClientError(Exception):
     """Base exception for go2rtc client."""
 
 
+class Go2RtcCircuitOpenError(Go2RtcClientError):
+    """Circuit breaker is open and requests fail fast."""
+
+
+class Go2RtcSnapshotTooLargeError(Go2RtcClientError):
+    """Snapshot exceeds the allowed size."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize."""
+        self._max_size = max_size
+
+    def __str__(self) -> str:
+        """Return exception message."""
+        return f"snapshot exceeds the maximum size of {self._max_size} bytes"
+
+
 class Go2RtcVersionError(Exception):
     """Base exception for go2rtc client."""
 
@@ -45,6 +63,18 @@ class Go2RtcVersionError(Exception):
         )
 
 
+_WRAPPED_ERRORS: Final = (
+    ClientError,
+    ExtraKeysError,
+    InvalidFieldValue,
+    JSONDecodeError,
+    MissingDiscriminatorError,
+    MissingField,
+    SuitableVariantNotFoundError,
+    UnserializableDataError,
+)
+
+
 def handle_error[**P, R](
     func: Callable[P, Coroutine[Any, Any, R]],
 ) -> Callable[P, Coroutine[Any, Any, R]]:
@@ -54,15 +84,24 @@ def handle_error[**P, R](
     async def _func(*args: P.args, **kwargs: P.kwargs) -> R:
         try:
             return await func(*args, **kwargs)
-        except (
-            ClientError,
-            ExtraKeysError,
-            InvalidFieldValue,
-            MissingDiscriminatorError,
-            MissingField,
-            SuitableVariantNotFoundError,
-            UnserializableDataError,
-        ) as exc:
+        except _WRAPPED_ERRORS as exc:
+            raise Go2RtcClientError from exc
+
+    return _func
+
+
+def handle_error_iter[**P, R](
+    func: Callable[P, AsyncGenerator[R, None]],
+) -> Callable[P, AsyncGenerator[R, None]]:
+    """Wrap aiohttp and mashumaro errors of an async iterator."""
+
+    @wraps(func)
+    async def _func(*args: P.args, **kwargs: P.kwargs) -> AsyncGenerator[R, None]:
+        try:
+            async with aclosing(func(*args, **kwargs)) as items:
+                async for item in items:
+                    yield item
+        except _WRAPPED_ERRORS as exc:
             raise Go2RtcClientError from exc
 
     return _func
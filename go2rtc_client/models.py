@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass, field
-from typing import Any, Literal
+from functools import lru_cache
+from typing import Any, Final, Literal
+from urllib.parse import parse_qsl
 
 from awesomeversion import AwesomeVersion
 from mashumaro import field_options
+from mashumaro.codecs.basic import BasicDecoder
 from mashumaro.mixins.orjson import DataClassORJSONMixin
 from mashumaro.types import SerializationStrategy
 
+from .exceptions import _WRAPPED_ERRORS, Go2RtcClientError
+
 
 class _AwesomeVersionSerializer(SerializationStrategy):
     def serialize(self, value: AwesomeVersion) -> str:
@@ -19,7 +25,7 @@ class _AwesomeVersionSerializer(SerializationStrategy):
         return AwesomeVersion(value)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ApplicationInfo(DataClassORJSONMixin):
     """Application info model.
 
@@ -38,7 +44,7 @@ class Streams(DataClassORJSONMixin):
     streams: dict[str, Stream]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Stream:
     """Stream model."""
 
@@ -53,14 +59,58 @@ class Stream:
 
         return d
 
+    def has_sources(self, sources: str | list[str]) -> bool:
+        """Return if the producer urls are exactly the given sources."""
+        expected = {sources} if isinstance(sources, str) else set(sources)
+        return {producer.url for producer in self.producers} == expected
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Producer:
     """Producer model."""
 
     url: str
 
 
+class LazyStreams(Mapping[str, Stream]):
+    """Streams mapping decoding each stream on first access.
+
+    The stream names are available without decoding any stream or producer.
+    """
+
+    __slots__ = ("_decoded", "_raw")
+
+    def __init__(self, raw: dict[str, Any]) -> None:
+        """Initialize mapping."""
+        self._raw = raw
+        self._decoded: dict[str, Stream] = {}
+
+    def __getitem__(self, name: str) -> Stream:
+        """Return the stream and decode it if needed.
+
+        Raise Go2RtcClientError if the stream is invalid, like the eager listing.
+        """
+        if (stream := self._decoded.get(name)) is None:
+            try:
+                stream = _STREAM_DECODER.decode(self._raw[name])
+            except _WRAPPED_ERRORS as exc:
+                raise Go2RtcClientError from exc
+            self._decoded[name] = stream
+        return stream
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the stream names."""
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        """Return the number of streams."""
+        return len(self._raw)
+
+    def __contains__(self, name: object) -> bool:
+        """Return if a stream with the name exists."""
+        return name in self._raw
+
+
 @dataclass
 class WebRTCSdp(DataClassORJSONMixin):
     """WebRTC SDP model."""
@@ -83,8 +133,116 @@ class WebRTCSdpAnswer(WebRTCSdp):
     type: Literal["answer"] = field(default="answer", init=False)
 
 
-@dataclass
+_CODEC_SEPARATORS: Final = frozenset(",&=")
+_PRELOAD_MEDIA: Final = ("video", "audio", "microphone")
+
+
+def _normalize_codecs(codecs: Iterable[str] | None) -> tuple[str, ...] | None:
+    """Return the codecs lower case and without duplicates."""
+    if codecs is None:
+        return None
+    return tuple(dict.fromkeys(codec.strip().lower() for codec in codecs))
+
+
+def _check_codecs(codecs: tuple[str, ...]) -> None:
+    """Raise a ValueError if a codec would break the query."""
+    for codec in codecs:
+        if not codec or not _CODEC_SEPARATORS.isdisjoint(codec):
+            msg = f"Invalid codec: {codec!r}"
+            raise ValueError(msg)
+
+
+@dataclass(frozen=True, slots=True)
+class PreloadConfig:
+    """Media and codec filters of a preload.
+
+    None means the media is not preloaded and an empty filter allows any codec.
+    The default preloads video and audio with any codec, like go2rtc does. The
+    filters are normalized, so equal filters compare equal. The order of the
+    codecs is kept, as it is the order of preference.
+    """
+
+    video_codec_filter: tuple[str, ...] | None = ()
+    audio_codec_filter: tuple[str, ...] | None = ()
+    microphone_codec_filter: tuple[str, ...] | None = None
+
+    def __post_init__(self) -> None:
+        """Normalize the filters."""
+        for media in _PRELOAD_MEDIA:
+            name = f"{media}_codec_filter"
+            object.__setattr__(self, name, _normalize_codecs(getattr(self, name)))
+
+    @classmethod
+    def from_codecs(
+        cls,
+        video: Iterable[str] | None = None,
+        audio: Iterable[str] | None = None,
+        microphone: Iterable[str] | None = None,
+    ) -> PreloadConfig:
+        """Return the config for the given codec filters.
+
+        Video and audio are always preloaded, the microphone only if it is
+        filtered. An empty filter is the same as no filter.
+        """
+        return cls(
+            tuple(video or ()), tuple(audio or ()), tuple(microphone or ()) or None
+        )
+
+    @classmethod
+    def from_query(cls, query: str) -> PreloadConfig:
+        """Return the media and codec filters of a query like video=h264&audio."""
+        return _parse_preload_query(query)
+
+    @property
+    def params(self) -> dict[str, str]:
+        """Return the query parameters to enable the preload.
+
+        A ValueError is raised for an empty codec or one containing a separator.
+        """
+        params: dict[str, str] = {}
+        for media in _PRELOAD_MEDIA:
+            if codecs := getattr(self, f"{media}_codec_filter"):
+                _check_codecs(codecs)
+                params[f"{media}_codec_filter"] = ",".join(codecs)
+        return params
+
+
+@lru_cache(maxsize=256)
+def _parse_preload_query(query: str) -> PreloadConfig:
+    """Parse a preload query.
+
+    Values may be comma separated or repeated and media without codecs are not
+    filtered. Parameters other than the media are ignored and the codecs are
+    kept as sent by the server.
+    """
+    filters: dict[str, list[str]] = {}
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key in _PRELOAD_MEDIA:
+            filters.setdefault(key, []).extend(c for c in value.split(",") if c)
+    return PreloadConfig(
+        *(_normalize_codecs(filters.get(media)) for media in _PRELOAD_MEDIA)
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class Preload(DataClassORJSONMixin):
     """Preload model."""
 
     query: str
+
+    @property
+    def config(self) -> PreloadConfig:
+        """Return the codec filters of the preload."""
+        return PreloadConfig.from_query(self.query)
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotRequest:
+    """Snapshot request model."""
+
+    name: str
+    width: int | None = None
+    height: int | None = None
+
+
+_STREAM_DECODER = BasicDecoder(Stream)
@@ -0,0 +1,221 @@
+"""Policies for the communication with the go2rtc server."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import StrEnum
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Final
+
+from aiohttp import (
+    BaseConnector,
+    ClientError,
+    ClientResponseError,
+    ClientTimeout,
+    TCPConnector,
+    UnixConnector,
+)
+
+from .exceptions import Go2RtcCircuitOpenError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT: Final = ClientTimeout(total=10)
+
+
+@dataclass(frozen=True, slots=True)
+class TimeoutPolicy:
+    """Client side timeouts per endpoint class.
+
+    The timeouts are built once and reused for every request. info is used for
+    the application info endpoint, snapshot for JPEG snapshots, webrtc for the
+    SDP negotiation and default for all other endpoints.
+    """
+
+    default: ClientTimeout = DEFAULT_TIMEOUT
+    info: ClientTimeout = DEFAULT_TIMEOUT
+    snapshot: ClientTimeout = DEFAULT_TIMEOUT
+    webrtc: ClientTimeout = DEFAULT_TIMEOUT
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectionPolicy:
+    """Connection pool settings for a client owned session.
+
+    limit bounds the open connections to the server and keepalive_timeout
+    closes idle connections. If unix_socket is set, the server is reached via
+    the socket, e.g. for a local go2rtc. Otherwise host names are resolved at
+    most once per dns_cache_ttl seconds.
+    """
+
+    limit: int = 10
+    keepalive_timeout: float = 15.0
+    dns_cache_ttl: int | None = 300
+    unix_socket: str | None = None
+
+    def create_connector(self) -> BaseConnector:
+        """Create the connector."""
+        if self.unix_socket is not None:
+            return UnixConnector(
+                self.unix_socket,
+                limit=self.limit,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+        return TCPConnector(
+            limit=self.limit,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.dns_cache_ttl is not None,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BackoffPolicy:
+    """Exponential backoff with optional full jitter."""
+
+    initial: float = 0.5
+    maximum: float = 10.0
+    multiplier: float = 2.0
+    jitter: bool = True
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay in seconds after the given failed attempt."""
+        delay = min(self.maximum, self.initial * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, delay)  # noqa: S311
+        return delay
+
+
+class RetryBudget:
+    """Token bucket limiting the retries across all requests of a client.
+
+    Every request deposits ratio tokens and every retry withdraws one token,
+    so retries cannot amplify an outage beyond the given ratio of requests.
+    """
+
+    def __init__(self, *, ratio: float = 0.2, max_tokens: float = 10.0) -> None:
+        """Initialize budget."""
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    @property
+    def tokens(self) -> float:
+        """Return the available tokens."""
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Deposit the tokens of a request."""
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        """Withdraw the token of a retry and return if it was available."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Retry policy for idempotent requests.
+
+    Connection errors, timeouts and the given status codes are retried until
+    max_attempts is reached or the shared budget is exhausted.
+    """
+
+    max_attempts: int = 3
+    backoff: BackoffPolicy = BackoffPolicy()
+    retry_on_status: frozenset[int] = frozenset({502, 503, 504})
+    budget: RetryBudget = field(default_factory=RetryBudget)
+
+    def is_retryable(self, err: Exception) -> bool:
+        """Return if the error is transient."""
+        if isinstance(err, ClientResponseError):
+            return err.status in self.retry_on_status
+        return isinstance(err, ClientError | TimeoutError)
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker for the communication with the server.
+
+    The circuit opens after failure_threshold consecutive failures and requests
+    fail fast with Go2RtcCircuitOpenError. After reset_timeout the circuit is
+    half open and a single probe decides if it closes or opens again.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        on_state_change: Callable[[CircuitState, CircuitState], None] | None = None,
+    ) -> None:
+        """Initialize circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._on_state_change = on_state_change
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._changed_at = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current state."""
+        return self._state
+
+    def before_request(self) -> bool:
+        """Check the circuit before a request.
+
+        Raise Go2RtcCircuitOpenError if the request is not allowed. Return True
+        if the caller must probe the server first.
+        """
+        if self._state is CircuitState.CLOSED:
+            return False
+        if time.monotonic() < self._changed_at + self._reset_timeout:
+            raise Go2RtcCircuitOpenError
+        # Also covers a probe which never reported back, e.g. when cancelled
+        self._set_state(CircuitState.HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self._failures = 0
+        if self._state is not CircuitState.CLOSED:
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self._failures += 1
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        """Set the state and notify the callback."""
+        old_state = self._state
+        self._state = state
+        self._changed_at = time.monotonic()
+        if old_state is state:
+            return
+        _LOGGER.debug("Circuit changed from %s to %s", old_state, state)
+        if self._on_state_change is not None:
+            try:
+                self._on_state_change(old_state, state)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error on circuit state callback")
@@ -0,0 +1,183 @@
+"""Declarative reconciliation of the server configuration."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING, Final
+
+from .bulk import BulkResult, bounded_as_completed
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .models import Preload, PreloadConfig, Stream
+    from .rest import Go2RtcRestClient
+
+
+@dataclass(frozen=True, slots=True)
+class DesiredState:
+    """Desired streams and preloads of the server."""
+
+    streams: Mapping[str, str | list[str]] = field(default_factory=dict)
+    preloads: Mapping[str, PreloadConfig] = field(default_factory=dict)
+
+
+class ActionKind(StrEnum):
+    """Kind of a reconcile action."""
+
+    ADD_STREAM = "add_stream"
+    UPDATE_STREAM = "update_stream"
+    DELETE_STREAM = "delete_stream"
+    ENABLE_PRELOAD = "enable_preload"
+    DISABLE_PRELOAD = "disable_preload"
+
+
+@dataclass(frozen=True, slots=True)
+class ReconcileAction:
+    """Change needed to reach the desired state."""
+
+    kind: ActionKind
+    name: str
+    sources: tuple[str, ...] = ()
+    preload: PreloadConfig | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ReconcileResult:
+    """Planned actions and the result of each applied action.
+
+    results is empty for a dry run.
+    """
+
+    actions: list[ReconcileAction]
+    results: list[BulkResult[ReconcileAction, None]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Return if all applied actions succeeded."""
+        return all(result.ok for result in self.results)
+
+
+_STREAM_ACTIONS: Final = frozenset(
+    {ActionKind.ADD_STREAM, ActionKind.UPDATE_STREAM, ActionKind.DELETE_STREAM}
+)
+
+
+class Reconciler:
+    """Apply the minimal set of changes to reach a desired state.
+
+    Streams are compared by the urls of their producers and preloads by their
+    codec filters. Streams are changed first, so that preloads can refer to
+    them. Streams and preloads which are not desired are only deleted and
+    disabled if prune is set.
+    """
+
+    def __init__(
+        self,
+        client: Go2RtcRestClient,
+        *,
+        concurrency: int = 8,
+        item_timeout: float | None = None,
+        prune: bool = False,
+    ) -> None:
+        """Initialize reconciler."""
+        self._client = client
+        self._concurrency = concurrency
+        self._item_timeout = item_timeout
+        self._prune = prune
+
+    async def plan(self, desired: DesiredState) -> list[ReconcileAction]:
+        """Return the actions needed to reach the desired state."""
+        streams, preloads = await asyncio.gather(
+            self._client.streams.list(), self._client.preload.list()
+        )
+        return _plan(desired, streams, preloads, prune=self._prune)
+
+    async def reconcile(
+        self, desired: DesiredState, *, dry_run: bool = False
+    ) -> ReconcileResult:
+        """Reconcile the server with the desired state.
+
+        In dry run mode the actions are only planned.
+        """
+        actions = await self.plan(desired)
+        if dry_run:
+            return ReconcileResult(actions)
+        results: list[BulkResult[ReconcileAction, None]] = []
+        stream_actions = [a for a in actions if a.kind in _STREAM_ACTIONS]
+        preload_actions = [a for a in actions if a.kind not in _STREAM_ACTIONS]
+        for batch in (stream_actions, preload_actions):
+            results.extend(
+                [
+                    result
+                    async for result in bounded_as_completed(
+                        batch,
+                        self._apply,
+                        concurrency=self._concurrency,
+                        item_timeout=self._item_timeout,
+                    )
+                ]
+            )
+        return ReconcileResult(actions, results)
+
+    async def _apply(self, action: ReconcileAction) -> None:
+        """Apply a single action."""
+        match action.kind:
+            case ActionKind.ADD_STREAM:
+                await self._client.streams.add(action.name, list(action.sources))
+            case ActionKind.UPDATE_STREAM if len(action.sources) == 1:
+                await self._client.streams.update(action.name, action.sources[0])
+            case ActionKind.UPDATE_STREAM:
+                # go2rtc updates only a single source, adding replaces the stream
+                await self._client.streams.add(action.name, list(action.sources))
+            case ActionKind.DELETE_STREAM:
+                await self._client.streams.delete(action.name)
+            case ActionKind.ENABLE_PRELOAD:
+                await self._client.preload.enable(action.name, config=action.preload)
+            case ActionKind.DISABLE_PRELOAD:
+                await self._client.preload.disable(action.name)
+
+
+def _plan(
+    desired: DesiredState,
+    streams: Mapping[str, Stream],
+    preloads: Mapping[str, Preload],
+    *,
+    prune: bool,
+) -> list[ReconcileAction]:
+    """Compare the desired and the current state."""
+    actions: list[ReconcileAction] = []
+    for name, sources in desired.streams.items():
+        if (stream := streams.get(name)) is None:
+            kind = ActionKind.ADD_STREAM
+        elif not stream.has_sources(sources):
+            kind = ActionKind.UPDATE_STREAM
+        else:
+            continue
+        actions.append(
+            ReconcileAction(
+                kind,
+                name,
+                (sources,) if isinstance(sources, str) else tuple(sources),
+            )
+        )
+    if prune:
+        actions.extend(
+            ReconcileAction(ActionKind.DELETE_STREAM, name)
+            for name in streams
+            if name not in desired.streams
+        )
+    actions.extend(
+        ReconcileAction(ActionKind.ENABLE_PRELOAD, name, preload=config)
+        for name, config in desired.preloads.items()
+        if (preload := preloads.get(name)) is None or preload.config != config
+    )
+    if prune:
+        actions.extend(
+            ReconcileAction(ActionKind.DISABLE_PRELOAD, name)
+            for name in preloads
+            if name not in desired.preloads
+        )
+    return actions
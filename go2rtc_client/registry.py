@@ -0,0 +1,123 @@
+"""Stream registry for the go2rtc client."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from .cache import _retrieve_exception
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .models import Producer, Stream
+    from .rest import Go2RtcRestClient
+
+
+@dataclass(frozen=True, slots=True)
+class StreamChange:
+    """Producers added to or removed from a stream."""
+
+    added_producers: list[Producer] = field(default_factory=list)
+    removed_producers: list[Producer] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class StreamsDiff:
+    """Difference between two stream listings."""
+
+    added: dict[str, Stream] = field(default_factory=dict)
+    removed: dict[str, Stream] = field(default_factory=dict)
+    changed: dict[str, StreamChange] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        """Return if there are any changes."""
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_streams(old: Mapping[str, Stream], new: Mapping[str, Stream]) -> StreamsDiff:
+    """Return the difference between two stream listings.
+
+    Producers are compared by their url.
+    """
+    diff = StreamsDiff(
+        added={name: stream for name, stream in new.items() if name not in old},
+        removed={name: stream for name, stream in old.items() if name not in new},
+    )
+    for name, stream in new.items():
+        if (old_stream := old.get(name)) is None:
+            continue
+        old_urls = {producer.url for producer in old_stream.producers}
+        new_urls = {producer.url for producer in stream.producers}
+        if old_urls == new_urls:
+            continue
+        diff.changed[name] = StreamChange(
+            added_producers=[p for p in stream.producers if p.url not in old_urls],
+            removed_producers=[
+                p for p in old_stream.producers if p.url not in new_urls
+            ],
+        )
+    return diff
+
+
+class StreamRegistry:
+    """Cached view of the streams registered with the server.
+
+    The listing is refreshed at most once per TTL and concurrent refreshes
+    share a single request. Each refresh returns the difference to the previous
+    listing, so consumers only need to process the changes.
+    """
+
+    def __init__(self, client: Go2RtcRestClient, *, ttl: float = 5.0) -> None:
+        """Initialize registry."""
+        self._client = client
+        self._ttl = ttl
+        self._streams: dict[str, Stream] = {}
+        self._expires: float | None = None
+        self._refresh_task: asyncio.Task[StreamsDiff] | None = None
+
+    @property
+    def streams(self) -> Mapping[str, Stream]:
+        """Return the last fetched streams."""
+        return MappingProxyType(self._streams)
+
+    @property
+    def expired(self) -> bool:
+        """Return if the cached listing is expired."""
+        return self._expires is None or time.monotonic() >= self._expires
+
+    async def list(self) -> Mapping[str, Stream]:
+        """Return the streams and refresh them if the listing is expired."""
+        await self.refresh()
+        return self.streams
+
+    async def refresh(self, *, force: bool = False) -> StreamsDiff:
+        """Refresh the streams and return the changes.
+
+        An empty diff is returned if the listing is not expired yet.
+        """
+        if not force and not self.expired:
+            return StreamsDiff()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+            self._refresh_task.add_done_callback(_retrieve_exception)
+        # Shield the refresh, so a cancelled caller does not cancel the others
+        return await asyncio.shield(self._refresh_task)
+
+    def invalidate(self) -> None:
+        """Expire the cached listing."""
+        self._expires = None
+
+    async def _refresh(self) -> StreamsDiff:
+        """Fetch the streams and compare them with the previous listing."""
+        try:
+            streams = await self._client.streams.list()
+        finally:
+            self._refresh_task = None
+        diff = diff_streams(self._streams, streams)
+        self._streams = streams
+        self._expires = time.monotonic() + self._ttl
+        return diff
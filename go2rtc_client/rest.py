@@ -2,28 +2,60 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
+import asyncio
+from functools import lru_cache, partial
 import logging
-from typing import TYPE_CHECKING, Any, Final, Literal
-
-from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
+from typing import TYPE_CHECKING, Any, Final, Literal, Self
+
+from aiohttp import (
+    ClientError,
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    ClientTimeout,
+)
 from aiohttp.client import _RequestOptions
 from awesomeversion import AwesomeVersion, AwesomeVersionException
-from mashumaro.codecs.basic import BasicDecoder
+from mashumaro.codecs.orjson import ORJSONDecoder
 from mashumaro.mixins.dict import DataClassDictMixin
+import orjson
 from yarl import URL
 
-from .exceptions import Go2RtcVersionError, handle_error
-from .models import ApplicationInfo, Preload, Stream, WebRTCSdpAnswer, WebRTCSdpOffer
+from .bulk import BulkResult, bounded_as_completed
+from .exceptions import (
+    Go2RtcSnapshotTooLargeError,
+    Go2RtcVersionError,
+    handle_error,
+    handle_error_iter,
+)
+from .models import (
+    ApplicationInfo,
+    LazyStreams,
+    Preload,
+    PreloadConfig,
+    SnapshotRequest,
+    Stream,
+    WebRTCSdpAnswer,
+    WebRTCSdpOffer,
+)
+from .policies import CircuitBreaker, ConnectionPolicy, RetryPolicy, TimeoutPolicy
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import AsyncGenerator, Callable, Iterable, Mapping
+
+    from _typeshed import SupportsWrite
+
+    from .cache import SnapshotCache
 
 _LOGGER = logging.getLogger(__name__)
 
 _API_PREFIX = "/api"
 _MIN_VERSION_SUPPORTED: Final = AwesomeVersion("1.9.13")
 _MIN_VERSION_UNSUPPORTED: Final = AwesomeVersion("2.0.0")
+_SNAPSHOT_PATH: Final = f"{_API_PREFIX}/frame.jpeg"
+_SNAPSHOT_CHUNK_SIZE: Final = 64 * 1024
+_SNAPSHOT_CONCURRENCY: Final = 4
+_STREAMS_CONCURRENCY: Final = 8
 
 
 @lru_cache(maxsize=2)
@@ -32,32 +64,126 @@ def _version_is_supported(version: AwesomeVersion) -> bool:
     return _MIN_VERSION_SUPPORTED <= version < _MIN_VERSION_UNSUPPORTED
 
 
+def _snapshot_params(
+    name: str, width: int | None, height: int | None
+) -> dict[str, str | int]:
+    """Return the query parameters for a snapshot request."""
+    params: dict[str, str | int] = {"src": name}
+    if width:
+        params["width"] = width
+    if height:
+        params["height"] = height
+    return params
+
+
 class _BaseClient:
     """Base client for go2rtc."""
 
-    def __init__(self, websession: ClientSession, server_url: str) -> None:
+    def __init__(
+        self,
+        websession: ClientSession,
+        server_url: str,
+        *,
+        timeouts: TimeoutPolicy | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
         """Initialize Client."""
         self._session = websession
         self._base_url = URL(server_url)
+        self.timeouts: Final = timeouts or TimeoutPolicy()
+        self.retry: Final = retry
+        self.circuit_breaker: Final = circuit_breaker
+        self._access_listeners: list[Callable[[str], None]] = []
+
+    def subscribe_access(self, callback: Callable[[str], None]) -> Callable[[], None]:
+        """Subscribe to stream accesses."""
+        self._access_listeners.append(callback)
+
+        def _unsubscribe() -> None:
+            self._access_listeners.remove(callback)
+
+        return _unsubscribe
+
+    def record_access(self, name: str) -> None:
+        """Notify the access listeners that a stream was accessed."""
+        for listener in self._access_listeners:
+            try:
+                listener(name)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error on stream access callback")
 
     async def request(
         self,
-        method: Literal["GET", "PUT", "POST", "DELETE"],
+        method: Literal["GET", "PUT", "PATCH", "POST", "DELETE"],
         path: str,
         *,
         params: Mapping[str, Any] | None = None,
         data: DataClassDictMixin | dict[str, Any] | None = None,
+        request_timeout: ClientTimeout | None = None,
     ) -> ClientResponse:
-        """Make a request to the server."""
+        """Make a request to the server.
+
+        Without a request timeout, the default timeout of the policy is used.
+        GET requests are retried according to the retry policy.
+        """
         url = self._base_url.with_path(path)
         _LOGGER.debug("request[%s] %s", method, url)
         if isinstance(data, DataClassDictMixin):
             data = data.to_dict()
-        kwargs = _RequestOptions(timeout=ClientTimeout(total=10))
+        kwargs = _RequestOptions(timeout=request_timeout or self.timeouts.default)
         if params:
             kwargs["params"] = params
         if data:
             kwargs["json"] = data
+        if method != "GET" or self.retry is None:
+            return await self._send(method, url, kwargs)
+        return await self._send_with_retry(method, url, kwargs, self.retry)
+
+    async def _send(
+        self, method: str, url: URL, kwargs: _RequestOptions
+    ) -> ClientResponse:
+        """Send a request to the server guarded by the circuit breaker."""
+        if (breaker := self.circuit_breaker) is None:
+            return await self._send_unguarded(method, url, kwargs)
+        if breaker.before_request():
+            _LOGGER.debug("Probing %s", self._base_url)
+            probe = await self._send_guarded(
+                breaker,
+                "GET",
+                self._base_url.with_path(_API_PREFIX),
+                _RequestOptions(timeout=self.timeouts.info),
+            )
+            probe.release()
+        return await self._send_guarded(breaker, method, url, kwargs)
+
+    async def _send_guarded(
+        self,
+        breaker: CircuitBreaker,
+        method: str,
+        url: URL,
+        kwargs: _RequestOptions,
+    ) -> ClientResponse:
+        """Send a request to the server and report the outcome to the breaker."""
+        try:
+            resp = await self._send_unguarded(method, url, kwargs)
+        except ClientResponseError as err:
+            # Only server errors indicate a server failure
+            if err.status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except (ClientError, TimeoutError):
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return resp
+
+    async def _send_unguarded(
+        self, method: str, url: URL, kwargs: _RequestOptions
+    ) -> ClientResponse:
+        """Send a request to the server."""
         try:
             resp = await self._session.request(method, url, **kwargs)
         except ClientError as err:
@@ -67,6 +193,33 @@ class _BaseClient:
         resp.raise_for_status()
         return resp
 
+    async def _send_with_retry(
+        self, method: str, url: URL, kwargs: _RequestOptions, retry: RetryPolicy
+    ) -> ClientResponse:
+        """Send a request to the server and retry on transient errors."""
+        retry.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                return await self._send(method, url, kwargs)
+            except (ClientError, TimeoutError) as err:
+                if (
+                    attempt >= retry.max_attempts
+                    or not retry.is_retryable(err)
+                    or not retry.budget.withdraw()
+                ):
+                    raise
+                delay = retry.backoff.delay(attempt)
+                _LOGGER.debug(
+                    "request[%s] %s failed (%s), retrying in %.2fs",
+                    method,
+                    url,
+                    err,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
 
 class _ApplicationClient:
     PATH: Final = _API_PREFIX
@@ -76,10 +229,16 @@ class _ApplicationClient:
         self._client = client
 
     @handle_error
-    async def get_info(self) -> ApplicationInfo:
+    async def get_info(
+        self, *, request_timeout: ClientTimeout | None = None
+    ) -> ApplicationInfo:
         """Get application info."""
-        resp = await self._client.request("GET", self.PATH)
-        return ApplicationInfo.from_dict(await resp.json())
+        resp = await self._client.request(
+            "GET",
+            self.PATH,
+            request_timeout=request_timeout or self._client.timeouts.info,
+        )
+        return ApplicationInfo.from_json(await resp.read())
 
 
 class _WebRTCClient:
@@ -92,7 +251,11 @@ class _WebRTCClient:
         self._client = client
 
     async def _forward_sdp_offer(
-        self, stream_name: str, offer: WebRTCSdpOffer, src_or_dst: Literal["src", "dst"]
+        self,
+        stream_name: str,
+        offer: WebRTCSdpOffer,
+        src_or_dst: Literal["src", "dst"],
+        request_timeout: ClientTimeout | None,
     ) -> WebRTCSdpAnswer:
         """Forward an SDP offer to the server."""
         resp = await self._client.request(
@@ -100,22 +263,30 @@ class _WebRTCClient:
             self.PATH,
             params={src_or_dst: stream_name},
             data=offer,
+            request_timeout=request_timeout or self._client.timeouts.webrtc,
         )
-        return WebRTCSdpAnswer.from_dict(await resp.json())
+        return WebRTCSdpAnswer.from_json(await resp.read())
 
     @handle_error
     async def forward_whep_sdp_offer(
-        self, source_name: str, offer: WebRTCSdpOffer
+        self,
+        source_name: str,
+        offer: WebRTCSdpOffer,
+        *,
+        request_timeout: ClientTimeout | None = None,
     ) -> WebRTCSdpAnswer:
         """Forward an WHEP SDP offer to the server."""
+        self._client.record_access(source_name)
         return await self._forward_sdp_offer(
             source_name,
             offer,
             "src",
+            request_timeout,
         )
 
 
-_GET_STREAMS_DECODER = BasicDecoder(dict[str, Stream])
+# Decode the raw body with orjson instead of parsing it to a dict first
+_GET_STREAMS_DECODER = ORJSONDecoder(dict[str, Stream])
 
 
 class _StreamClient:
@@ -126,39 +297,182 @@ class _StreamClient:
         self._client = client
 
     @handle_error
-    async def add(self, name: str, sources: str | list[str]) -> None:
+    async def add(
+        self,
+        name: str,
+        sources: str | list[str],
+        *,
+        request_timeout: ClientTimeout | None = None,
+    ) -> None:
         """Add a stream to the server."""
         await self._client.request(
             "PUT",
             self.PATH,
             params={"name": name, "src": sources},
+            request_timeout=request_timeout,
+        )
+
+    def add_many(
+        self,
+        streams: Mapping[str, str | list[str]],
+        *,
+        concurrency: int = _STREAMS_CONCURRENCY,
+        item_timeout: float | None = None,
+    ) -> AsyncGenerator[BulkResult[str, None], None]:
+        """Add many streams with bounded concurrency.
+
+        Results are yielded as they complete. A failed stream is reported in
+        its result and does not fail the whole batch.
+        """
+        return bounded_as_completed(
+            streams,
+            lambda name: self.add(name, streams[name]),
+            concurrency=concurrency,
+            item_timeout=item_timeout,
+        )
+
+    @handle_error
+    async def update(
+        self,
+        name: str,
+        source: str,
+        *,
+        request_timeout: ClientTimeout | None = None,
+    ) -> None:
+        """Replace the sources of a stream with a single source.
+
+        go2rtc only reads a single source on update, use add to replace the
+        sources of a stream with several sources.
+        """
+        await self._client.request(
+            "PATCH",
+            self.PATH,
+            params={"name": name, "src": source},
+            request_timeout=request_timeout,
+        )
+
+    def update_many(
+        self,
+        streams: Mapping[str, str],
+        *,
+        concurrency: int = _STREAMS_CONCURRENCY,
+        item_timeout: float | None = None,
+    ) -> AsyncGenerator[BulkResult[str, None], None]:
+        """Update many streams with bounded concurrency.
+
+        Results are yielded as they complete. A failed stream is reported in
+        its result and does not fail the whole batch.
+        """
+        return bounded_as_completed(
+            streams,
+            lambda name: self.update(name, streams[name]),
+            concurrency=concurrency,
+            item_timeout=item_timeout,
         )
 
     @handle_error
-    async def list(self) -> dict[str, Stream]:
+    async def delete(
+        self, name: str, *, request_timeout: ClientTimeout | None = None
+    ) -> None:
+        """Delete a stream from the server."""
+        await self._client.request(
+            "DELETE",
+            self.PATH,
+            params={"src": name},
+            request_timeout=request_timeout,
+        )
+
+    def delete_many(
+        self,
+        names: Iterable[str],
+        *,
+        concurrency: int = _STREAMS_CONCURRENCY,
+        item_timeout: float | None = None,
+    ) -> AsyncGenerator[BulkResult[str, None], None]:
+        """Delete many streams with bounded concurrency.
+
+        Results are yielded as they complete. A failed stream is reported in
+        its result and does not fail the whole batch.
+        """
+        return bounded_as_completed(
+            names,
+            self.delete,
+            concurrency=concurrency,
+            item_timeout=item_timeout,
+        )
+
+    @handle_error_iter
+    async def sync(
+        self,
+        streams: Mapping[str, str | list[str]],
+        *,
+        concurrency: int = _STREAMS_CONCURRENCY,
+        item_timeout: float | None = None,
+    ) -> AsyncGenerator[BulkResult[str, bool], None]:
+        """Add the streams which are missing or have different sources.
+
+        Streams are compared by the urls of their producers. The value of a
+        result is True if the stream was added and False if it already matched.
+        """
+        current = await self.list()
+        missing: dict[str, str | list[str]] = {}
+        for name, sources in streams.items():
+            if (stream := current.get(name)) is not None and stream.has_sources(
+                sources
+            ):
+                yield BulkResult(name, value=False)
+            else:
+                missing[name] = sources
+        async for result in self.add_many(
+            missing, concurrency=concurrency, item_timeout=item_timeout
+        ):
+            yield BulkResult(result.key, value=result.ok, error=result.error)
+
+    @handle_error
+    async def list(
+        self, *, request_timeout: ClientTimeout | None = None
+    ) -> dict[str, Stream]:
         """List streams registered with the server."""
-        resp = await self._client.request("GET", self.PATH)
-        return _GET_STREAMS_DECODER.decode(await resp.json())
+        resp = await self._client.request(
+            "GET", self.PATH, request_timeout=request_timeout
+        )
+        return _GET_STREAMS_DECODER.decode(await resp.read())
+
+    @handle_error
+    async def list_lazy(
+        self, *, request_timeout: ClientTimeout | None = None
+    ) -> LazyStreams:
+        """List streams registered with the server without decoding them.
+
+        Each stream is decoded on first access, which makes name only queries
+        cheap for large deployments.
+        """
+        resp = await self._client.request(
+            "GET", self.PATH, request_timeout=request_timeout
+        )
+        return LazyStreams(orjson.loads(await resp.read()))
 
 
 class _SchemesClient:
     PATH: Final = _API_PREFIX + "/schemes"
-    _DECODER = BasicDecoder(set[str])
+    _DECODER = ORJSONDecoder(set[str])
 
     def __init__(self, client: _BaseClient) -> None:
         """Initialize Client."""
         self._client = client
 
     @handle_error
-    async def list(self) -> set[str]:
+    async def list(self, *, request_timeout: ClientTimeout | None = None) -> set[str]:
         """List all supported schemes."""
-        resp = await self._client.request("GET", self.PATH)
-        return self._DECODER.decode(await resp.json())
+        resp = await self._client.request(
+            "GET", self.PATH, request_timeout=request_timeout
+        )
+        return self._DECODER.decode(await resp.read())
 
 
 class _PreloadClient:
     PATH: Final = f"{_API_PREFIX}/preload"
-    _DECODER = BasicDecoder(dict[str, Preload])
+    _DECODER = ORJSONDecoder(dict[str, Preload])
 
     def __init__(self, client: _BaseClient) -> None:
         """Initialize Client."""
@@ -169,56 +483,142 @@ class _PreloadClient:
         self,
         source: str,
         *,
+        config: PreloadConfig | None = None,
         video_codec_filter: list[str] | None = None,
         audio_codec_filter: list[str] | None = None,
         microphone_codec_filter: list[str] | None = None,
+        request_timeout: ClientTimeout | None = None,
     ) -> None:
-        """Enable preload for a stream."""
-        params = {"src": source}
-        if video_codec_filter:
-            params["video_codec_filter"] = ",".join(video_codec_filter)
-        if audio_codec_filter:
-            params["audio_codec_filter"] = ",".join(audio_codec_filter)
-        if microphone_codec_filter:
-            params["microphone_codec_filter"] = ",".join(microphone_codec_filter)
+        """Enable preload for a stream.
+
+        The codec filters are given as config or as lists. They are normalized
+        and a ValueError is raised for an invalid codec.
+        """
+        if config is None:
+            config = PreloadConfig.from_codecs(
+                video_codec_filter, audio_codec_filter, microphone_codec_filter
+            )
+        elif video_codec_filter or audio_codec_filter or microphone_codec_filter:
+            msg = "Config and codec filters cannot be set at the same time"
+            raise ValueError(msg)
+        params = {"src": source, **config.params}
         await self._client.request(
             "PUT",
             self.PATH,
             params=params,
+            request_timeout=request_timeout,
         )
 
     @handle_error
-    async def disable(self, source: str) -> None:
+    async def disable(
+        self, source: str, *, request_timeout: ClientTimeout | None = None
+    ) -> None:
         """Disable preload for a stream."""
         await self._client.request(
             "DELETE",
             self.PATH,
             params={"src": source},
+            request_timeout=request_timeout,
         )
 
     @handle_error
-    async def list(self) -> dict[str, Preload]:
+    async def list(
+        self, *, request_timeout: ClientTimeout | None = None
+    ) -> dict[str, Preload]:
         """List all preloaded streams."""
-        resp = await self._client.request("GET", self.PATH)
-        return self._DECODER.decode(await resp.json())
+        resp = await self._client.request(
+            "GET", self.PATH, request_timeout=request_timeout
+        )
+        return self._DECODER.decode(await resp.read())
 
 
 class Go2RtcRestClient:
     """Rest client for go2rtc server."""
 
-    def __init__(self, websession: ClientSession, server_url: str) -> None:
+    def __init__(
+        self,
+        websession: ClientSession,
+        server_url: str,
+        *,
+        snapshot_cache: SnapshotCache | None = None,
+        timeouts: TimeoutPolicy | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
         """Initialize Client."""
-        self._client = _BaseClient(websession, server_url)
+        self._client = _BaseClient(
+            websession,
+            server_url,
+            timeouts=timeouts,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+        )
+        self.snapshot_cache: Final = snapshot_cache
         self.application: Final = _ApplicationClient(self._client)
         self.preload: Final = _PreloadClient(self._client)
         self.schemes: Final = _SchemesClient(self._client)
         self.streams: Final = _StreamClient(self._client)
         self.webrtc: Final = _WebRTCClient(self._client)
+        self._owned_session: ClientSession | None = None
+
+    @classmethod
+    def create(
+        cls,
+        server_url: str,
+        *,
+        connection: ConnectionPolicy | None = None,
+        snapshot_cache: SnapshotCache | None = None,
+        timeouts: TimeoutPolicy | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> Self:
+        """Create a client with its own session.
+
+        The session uses a connector tuned by the connection policy and is
+        closed by close or when leaving the async context manager.
+        """
+        connection = connection or ConnectionPolicy()
+        session = ClientSession(connector=connection.create_connector())
+        client = cls(
+            session,
+            server_url,
+            snapshot_cache=snapshot_cache,
+            timeouts=timeouts,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+        )
+        client._owned_session = session
+        return client
+
+    def subscribe_access(self, callback: Callable[[str], None]) -> Callable[[], None]:
+        """Subscribe to stream accesses and return a function to unsubscribe.
+
+        The callback is called with the stream name on each snapshot request and
+        forwarded WHEP offer.
+        """
+        return self._client.subscribe_access(callback)
+
+    async def close(self) -> None:
+        """Close the session if it is owned by the client."""
+        if self._owned_session is not None:
+            await self._owned_session.close()
+
+    async def __aenter__(self) -> Self:
+        """Enter the client."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close the client."""
+        await self.close()
 
     @handle_error
-    async def validate_server_version(self) -> AwesomeVersion:
+    async def validate_server_version(
+        self, *, request_timeout: ClientTimeout | None = None
+    ) -> AwesomeVersion:
         """Validate the server version is compatible."""
-        application_info = await self.application.get_info()
+        application_info = await self.application.get_info(
+            request_timeout=request_timeout
+        )
         try:
             version_supported = _version_is_supported(application_info.version)
         except AwesomeVersionException as err:
@@ -238,15 +638,128 @@ class Go2RtcRestClient:
 
     @handle_error
     async def get_jpeg_snapshot(
-        self, name: str, width: int | None = None, height: int | None = None
+        self,
+        name: str,
+        width: int | None = None,
+        height: int | None = None,
+        *,
+        request_timeout: ClientTimeout | None = None,
     ) -> bytes:
-        """Get a JPEG snapshot from the stream."""
-        params: dict[str, str | int] = {"src": name}
-        if width:
-            params["width"] = width
-        if height:
-            params["height"] = height
+        """Get a JPEG snapshot from the stream.
+
+        If a snapshot cache is configured, cached snapshots are returned and
+        concurrent calls for the same snapshot share a single request.
+        """
+        self._client.record_access(name)
+        fetch = partial(
+            self._fetch_jpeg_snapshot,
+            _snapshot_params(name, width, height),
+            request_timeout,
+        )
+        if self.snapshot_cache is None:
+            return await fetch()
+        return await self.snapshot_cache.get((name, width, height), fetch)
+
+    def get_jpeg_snapshots(
+        self,
+        snapshots: Iterable[str | SnapshotRequest],
+        *,
+        concurrency: int = _SNAPSHOT_CONCURRENCY,
+        item_timeout: float | None = None,
+    ) -> AsyncGenerator[BulkResult[SnapshotRequest, bytes], None]:
+        """Get JPEG snapshots of many streams with bounded concurrency.
+
+        Results are yielded as they complete. A failed or timed out snapshot is
+        reported in its result and does not fail the whole batch.
+        """
+        requests = (
+            SnapshotRequest(item) if isinstance(item, str) else item
+            for item in snapshots
+        )
+        return bounded_as_completed(
+            requests,
+            lambda request: self.get_jpeg_snapshot(
+                request.name, request.width, request.height
+            ),
+            concurrency=concurrency,
+            item_timeout=item_timeout,
+        )
+
+    async def _fetch_jpeg_snapshot(
+        self, params: dict[str, str | int], request_timeout: ClientTimeout | None
+    ) -> bytes:
+        """Fetch a JPEG snapshot from the server."""
         resp = await self._client.request(
-            "GET", f"{_API_PREFIX}/frame.jpeg", params=params
+            "GET",
+            _SNAPSHOT_PATH,
+            params=params,
+            request_timeout=request_timeout or self._client.timeouts.snapshot,
         )
         return await resp.read()
+
+    @handle_error_iter
+    async def iter_jpeg_snapshot(
+        self,
+        name: str,
+        width: int | None = None,
+        height: int | None = None,
+        *,
+        chunk_size: int = _SNAPSHOT_CHUNK_SIZE,
+        max_size: int | None = None,
+        request_timeout: ClientTimeout | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream a JPEG snapshot from the stream in chunks.
+
+        Chunks are yielded as they are received, so the whole image is never
+        buffered. Go2RtcSnapshotTooLargeError is raised if the snapshot is
+        larger than max_size.
+        """
+        self._client.record_access(name)
+        resp = await self._client.request(
+            "GET",
+            _SNAPSHOT_PATH,
+            params=_snapshot_params(name, width, height),
+            request_timeout=request_timeout or self._client.timeouts.snapshot,
+        )
+        async with resp:
+            if (
+                max_size is not None
+                and resp.content_length is not None
+                and resp.content_length > max_size
+            ):
+                raise Go2RtcSnapshotTooLargeError(max_size)
+            received = 0
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                received += len(chunk)
+                if max_size is not None and received > max_size:
+                    raise Go2RtcSnapshotTooLargeError(max_size)
+                yield chunk
+
+    @handle_error
+    async def write_jpeg_snapshot(
+        self,
+        name: str,
+        fp: SupportsWrite[bytes],
+        width: int | None = None,
+        height: int | None = None,
+        *,
+        chunk_size: int = _SNAPSHOT_CHUNK_SIZE,
+        max_size: int | None = None,
+        request_timeout: ClientTimeout | None = None,
+    ) -> int:
+        """Write a JPEG snapshot from the stream into a file like object.
+
+        Return the number of bytes written.
+        """
+        written = 0
+        async for chunk in self.iter_jpeg_snapshot(
+            name,
+            width,
+            height,
+            chunk_size=chunk_size,
+            max_size=max_size,
+            request_timeout=request_timeout,
+        ):
+            fp.write(chunk)
+            written += len(chunk)
+        return written
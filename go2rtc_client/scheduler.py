@@ -0,0 +1,169 @@
+"""Preload streams based on their recent accesses."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import contextlib
+from dataclasses import dataclass, field
+from enum import StrEnum
+import logging
+import time
+from typing import TYPE_CHECKING, Final
+
+from .bulk import BulkResult, bounded_as_completed
+from .exceptions import Go2RtcClientError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .rest import Go2RtcRestClient
+
+_LOGGER = logging.getLogger(__name__)
+
+_PRELOAD_CONCURRENCY: Final = 4
+
+
+class EvictionPolicy(StrEnum):
+    """Which streams are evicted if more streams are accessed than preloaded."""
+
+    LRU = "lru"
+    LFU = "lfu"
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleResult:
+    """Preloads enabled and disabled by a schedule run."""
+
+    enabled: list[BulkResult[str, None]] = field(default_factory=list)
+    disabled: list[BulkResult[str, None]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Return if all changes succeeded."""
+        return all(result.ok for result in (*self.enabled, *self.disabled))
+
+
+class PreloadScheduler:
+    """Preload the most accessed streams.
+
+    Snapshot requests and forwarded WHEP offers of the client are counted as
+    accesses. Only accesses within the window are taken into account. Each run
+    preloads up to max_preloads streams, ranked by the number of accesses (LFU)
+    or by the last access (LRU), and disables the preloads of evicted streams.
+    Streams which are already preloaded otherwise are skipped, so preloads
+    which were not enabled by the scheduler are never changed or disabled.
+    """
+
+    def __init__(
+        self,
+        client: Go2RtcRestClient,
+        *,
+        max_preloads: int = 4,
+        eviction: EvictionPolicy = EvictionPolicy.LFU,
+        window: float = 600.0,
+        interval: float = 30.0,
+    ) -> None:
+        """Initialize scheduler."""
+        if max_preloads < 1:
+            msg = "Max preloads must be at least 1"
+            raise ValueError(msg)
+        self._client = client
+        self._max_preloads = max_preloads
+        self.eviction: Final = eviction
+        self._window = window
+        self._interval = interval
+        self._accesses: dict[str, deque[float]] = {}
+        self._preloaded: set[str] = set()
+        self._unsubscribe: Callable[[], None] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def preloaded(self) -> frozenset[str]:
+        """Return the streams preloaded by the scheduler."""
+        return frozenset(self._preloaded)
+
+    def record_access(self, name: str) -> None:
+        """Record an access of a stream."""
+        self._accesses.setdefault(name, deque()).append(time.monotonic())
+
+    def candidates(self) -> list[str]:
+        """Return the streams which should be preloaded, best ranked first."""
+        cutoff = time.monotonic() - self._window
+        for name, accesses in list(self._accesses.items()):
+            while accesses and accesses[0] < cutoff:
+                accesses.popleft()
+            if not accesses:
+                del self._accesses[name]
+        if self.eviction is EvictionPolicy.LRU:
+            ranked = sorted(
+                self._accesses, key=lambda name: self._accesses[name][-1], reverse=True
+            )
+        else:
+            ranked = sorted(
+                self._accesses,
+                key=lambda name: (len(self._accesses[name]), self._accesses[name][-1]),
+                reverse=True,
+            )
+        return ranked[: self._max_preloads]
+
+    async def schedule(self) -> ScheduleResult:
+        """Enable and disable preloads to match the candidates.
+
+        Evicted preloads are disabled first, so the number of preloads never
+        exceeds max_preloads. Failed changes are retried on the next run.
+        """
+        candidates = self.candidates()
+        evicted = [name for name in self._preloaded if name not in candidates]
+        result = ScheduleResult()
+        async for disabled in bounded_as_completed(
+            evicted, self._client.preload.disable, concurrency=_PRELOAD_CONCURRENCY
+        ):
+            if disabled.ok:
+                self._preloaded.discard(disabled.key)
+            result.disabled.append(disabled)
+        if missing := [name for name in candidates if name not in self._preloaded]:
+            preloads = await self._client.preload.list()
+            missing = [name for name in missing if name not in preloads]
+        async for enabled in bounded_as_completed(
+            missing,
+            self._client.preload.enable,
+            concurrency=_PRELOAD_CONCURRENCY,
+        ):
+            if enabled.ok:
+                self._preloaded.add(enabled.key)
+            result.enabled.append(enabled)
+        return result
+
+    def start(self) -> None:
+        """Start recording accesses and scheduling preloads periodically."""
+        if self._task is not None:
+            return
+        self._unsubscribe = self._client.subscribe_access(self.record_access)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the scheduler, the preloads stay enabled."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if (task := self._task) is not None:
+            self._task = None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _run(self) -> None:
+        """Schedule the preloads periodically."""
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                result = await self.schedule()
+            except Go2RtcClientError:
+                _LOGGER.exception("Error scheduling preloads")
+                continue
+            for failed in (*result.enabled, *result.disabled):
+                if not failed.ok:
+                    _LOGGER.warning(
+                        "Error changing preload of %s: %s", failed.key, failed.error
+                    )
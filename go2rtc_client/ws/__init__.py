@@ -1,6 +1,7 @@
 """Websocket module."""
 
-from .client import Go2RtcWsClient
+from .client import ConnectionState, Go2RtcWsClient
+from .delivery import DeliveryStats, MessageQueue, OverflowPolicy
 from .messages import (
     ReceiveMessages,
     SendMessages,
@@ -9,11 +10,19 @@ from .messages import (
     WebRTCOffer,
     WsError,
 )
+from .pool import Go2RtcWsPool, Go2RtcWsSession, SessionState
 
 __all__ = [
+    "ConnectionState",
+    "DeliveryStats",
     "Go2RtcWsClient",
+    "Go2RtcWsPool",
+    "Go2RtcWsSession",
+    "MessageQueue",
+    "OverflowPolicy",
     "ReceiveMessages",
     "SendMessages",
+    "SessionState",
     "WebRTCAnswer",
     "WebRTCCandidate",
     "WebRTCOffer",
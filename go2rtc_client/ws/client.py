@@ -1,22 +1,59 @@
 """Websocket client for go2rtc server."""
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import AsyncGenerator, Callable
+import contextlib
+from enum import StrEnum
 import logging
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, Literal, overload
 from urllib.parse import urljoin
 
-from aiohttp import ClientSession, ClientWebSocketResponse, WSMsgType
+from aiohttp import ClientError, ClientSession, ClientWebSocketResponse, WSMsgType
+import orjson
 
-from go2rtc_client.exceptions import handle_error
+from go2rtc_client.exceptions import Go2RtcClientError, handle_error
+from go2rtc_client.policies import BackoffPolicy
 
-from .messages import BaseMessage, ReceiveMessages, SendMessages, WebRTC, WsMessage
+from .delivery import MessageQueue, OverflowPolicy
+from .messages import (
+    ReceiveMessages,
+    SendMessages,
+    WebRTC,
+    WebRTCCandidate,
+    WsMessage,
+    decode_message,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class ConnectionState(StrEnum):
+    """State of the websocket connection."""
+
+    DISCONNECTED = "disconnected"
+    CONNECTED = "connected"
+    RECONNECTING = "reconnecting"
+
+
 class Go2RtcWsClient:
-    """Websocket client for go2rtc server."""
+    """Websocket client for go2rtc server.
+
+    If reconnect is set, a lost connection is reconnected with the given
+    backoff until close is called. Subscribers stay registered meanwhile.
+
+    If heartbeat is set, a ping is sent every heartbeat seconds and the round
+    trip time is exposed as latency. A connection without a pong within
+    heartbeat seconds is considered dead and closed. While the receive loop
+    waits for a blocking queue, pongs cannot be read, so the deadline starts
+    again once the loop resumes.
+
+    If candidate_window is set, outgoing ICE candidates are buffered for the
+    given seconds or until the end of candidates and then sent together. go2rtc
+    expects a single candidate per message, so each candidate is still its own
+    frame, but the frames of a batch are written back to back instead of
+    waiting for the transport after each candidate.
+    """
 
     def __init__(
         self,
@@ -25,6 +62,12 @@ class Go2RtcWsClient:
         *,
         source: str | None = None,
         destination: str | None = None,
+        reconnect: BackoffPolicy | None = None,
+        on_state_change: (
+            Callable[[ConnectionState, ConnectionState], None] | None
+        ) = None,
+        heartbeat: float | None = None,
+        candidate_window: float | None = None,
     ) -> None:
         """Initialize Client."""
         if source:
@@ -41,16 +84,42 @@ class Go2RtcWsClient:
         self._server_url = server_url
         self._session = session
         self._params = params
-        self._client: ClientWebSocketResponse | None = None
+        self._client: ClientWebSocketResponse[Literal[False]] | None = None
         self._rx_task: asyncio.Task[None] | None = None
         self._subscribers: list[Callable[[ReceiveMessages], None]] = []
+        self._handlers: dict[type, list[Callable[[Any], None]]] = {}
+        self._queues: set[MessageQueue[Any]] = set()
+        self._iterator_queues: set[MessageQueue[Any]] = set()
+        self._delivery_tasks: set[asyncio.Task[None]] = set()
         self._connect_lock = asyncio.Lock()
+        self._reconnect = reconnect
+        self._on_state_change = on_state_change
+        self._state = ConnectionState.DISCONNECTED
+        self._heartbeat = heartbeat
+        self._ping_sent: float | None = None
+        self._pong_received = asyncio.Event()
+        self._receiving = asyncio.Event()
+        self._receiving.set()
+        self._latency: float | None = None
+        self._candidate_window = candidate_window
+        self._pending_candidates: list[str] = []
+        self._flush_task: asyncio.Task[None] | None = None
 
     @property
     def connected(self) -> bool:
         """Return if we're currently connected."""
         return self._client is not None and not self._client.closed
 
+    @property
+    def state(self) -> ConnectionState:
+        """Return the connection state."""
+        return self._state
+
+    @property
+    def latency(self) -> float | None:
+        """Return the last measured round trip time in seconds."""
+        return self._latency
+
     @handle_error
     async def connect(self) -> None:
         """Connect to device."""
@@ -58,17 +127,41 @@ class Go2RtcWsClient:
             if self.connected:
                 return
 
-            _LOGGER.debug("Trying to connect to %s", self._server_url)
-            self._client = await self._session.ws_connect(
-                urljoin(self._server_url, "/api/ws"), params=self._params
-            )
+            await self._open()
+            # While reconnecting, the receive task resumes on the new connection
+            if self._rx_task is None or self._rx_task.done():
+                self._rx_task = asyncio.create_task(self._receive_messages())
 
-            self._rx_task = asyncio.create_task(self._receive_messages())
-            _LOGGER.info("Connected to %s", self._server_url)
+    async def _open(self) -> None:
+        """Open the websocket connection."""
+        _LOGGER.debug("Trying to connect to %s", self._server_url)
+        self._client = await self._session.ws_connect(
+            urljoin(self._server_url, "/api/ws"),
+            params=self._params,
+            # The pongs are needed to measure the latency
+            autoping=self._heartbeat is None,
+            # Text frames are passed to orjson without decoding them first
+            decode_text=False,
+        )
+        _LOGGER.info("Connected to %s", self._server_url)
+        self._set_state(ConnectionState.CONNECTED)
 
     @handle_error
     async def close(self) -> None:
-        """Close connection."""
+        """Close connection.
+
+        Buffered candidates are sent if connected and dropped otherwise.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self.connected:
+            await self.flush()
+        elif self._pending_candidates:
+            _LOGGER.debug(
+                "Dropping %s buffered ICE candidates", len(self._pending_candidates)
+            )
+            self._pending_candidates = []
         if self.connected:
             if TYPE_CHECKING:
                 assert self._client is not None
@@ -80,11 +173,26 @@ class Go2RtcWsClient:
             task = self._rx_task
             self._rx_task = None
             task.cancel()
-            await task
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._set_state(ConnectionState.DISCONNECTED)
 
     @handle_error
     async def send(self, message: SendMessages) -> None:
         """Send a message."""
+        if self._candidate_window is not None and isinstance(message, WebRTCCandidate):
+            self._pending_candidates.append(message.candidate)
+            # An empty candidate signals the end of candidates
+            if not message.candidate:
+                await self.flush()
+            elif self._flush_task is None:
+                self._flush_task = asyncio.create_task(
+                    self._flush_later(self._candidate_window)
+                )
+            return
+
+        # Keep the order of the buffered candidates and the message
+        await self.flush()
         if not self.connected:
             await self.connect()
 
@@ -93,54 +201,303 @@ class Go2RtcWsClient:
 
         await self._client.send_str(message.to_json())
 
-    def _process_text_message(self, data: Any) -> None:
-        """Process text message."""
+    @handle_error
+    async def flush(self) -> None:
+        """Send the buffered ICE candidates."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if not self._pending_candidates:
+            return
+        candidates = self._pending_candidates
+        self._pending_candidates = []
+        if not self.connected:
+            await self.connect()
+
+        if TYPE_CHECKING:
+            assert self._client is not None
+
+        client = self._client
+        await asyncio.gather(
+            *(
+                client.send_str(_candidate_to_json(candidate))
+                for candidate in candidates
+            )
+        )
+
+    async def _flush_later(self, delay: float) -> None:
+        """Send the buffered ICE candidates after the delay."""
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Go2RtcClientError:
+            _LOGGER.exception("Error sending ICE candidates")
+
+    def _process_message(self, data: bytes) -> None:
+        """Process text or binary message."""
         try:
-            message: WsMessage = BaseMessage.from_json(data)
+            message: WsMessage = decode_message(data)
         except Exception:  # pylint: disable=broad-except
-            _LOGGER.exception("Invalid message received: %s", data)
+            _LOGGER.exception(
+                "Invalid message received: %s", data.decode(errors="replace")
+            )
         else:
             if isinstance(message, WebRTC):
                 message = message.value
             if not isinstance(message, ReceiveMessages):
                 _LOGGER.error("Received unexpected message: %s", message)
                 return
-            for subscriber in self._subscribers:
+            for subscriber in (
+                *self._subscribers,
+                *self._handlers.get(type(message), ()),
+            ):
                 try:
                     subscriber(message)
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception("Error on subscriber callback")
 
     async def _receive_messages(self) -> None:
-        """Receive messages."""
+        """Receive messages and reconnect if enabled."""
+        try:
+            while True:
+                await self._receive_until_closed()
+                # The client is only cleared if close was called
+                if self._client is None or self._reconnect is None:
+                    break
+                _LOGGER.warning("Connection to %s lost", self._server_url)
+                self._set_state(ConnectionState.RECONNECTING)
+                await self._reconnect_with_backoff(self._reconnect)
+        finally:
+            # Iterators still receive the queued messages before the end, while
+            # queued subscribers stay registered until they unsubscribe
+            for queue in self._iterator_queues:
+                queue.close()
+            self._set_state(ConnectionState.DISCONNECTED)
+
+    async def _receive_until_closed(self) -> None:
+        """Receive messages until the connection is closed."""
         if TYPE_CHECKING:
             assert self._client
 
-        while self.connected:
-            msg = await self._client.receive()
-            match msg.type:
-                case (
-                    WSMsgType.CLOSE
-                    | WSMsgType.CLOSED
-                    | WSMsgType.CLOSING
-                    | WSMsgType.PING
-                    | WSMsgType.PONG
-                ):
-                    break
-                case WSMsgType.ERROR:
-                    _LOGGER.error("Error received: %s", msg.data)
-                case WSMsgType.TEXT:
-                    self._process_text_message(msg.data)
-                case _:
-                    _LOGGER.warning("Received unknown message: %s", msg)
+        heartbeat_task = (
+            asyncio.create_task(self._send_heartbeats(self._client, self._heartbeat))
+            if self._heartbeat
+            else None
+        )
+        try:
+            while self.connected:
+                msg = await self._client.receive()
+                match msg.type:
+                    case WSMsgType.CLOSE | WSMsgType.CLOSED | WSMsgType.CLOSING:
+                        break
+                    case WSMsgType.PING:
+                        await self._client.pong(msg.data)
+                    case WSMsgType.PONG:
+                        self._process_pong()
+                    case WSMsgType.ERROR:
+                        _LOGGER.error("Error received: %s", msg.data)
+                    case WSMsgType.TEXT | WSMsgType.BINARY:
+                        self._process_message(msg.data)
+                        await self._wait_for_blocking_queues()
+                    case _:
+                        _LOGGER.warning("Received unknown message: %s", msg)
+        finally:
+            if heartbeat_task:
+                heartbeat_task.cancel()
+
+    async def _send_heartbeats(
+        self, client: ClientWebSocketResponse[Literal[False]], interval: float
+    ) -> None:
+        """Send pings and close the connection if no pong is received."""
+        while True:
+            await asyncio.sleep(interval)
+            self._pong_received.clear()
+            self._ping_sent = time.monotonic()
+            await client.ping()
+            if not await self._wait_for_pong(interval):
+                _LOGGER.warning(
+                    "No pong received from %s within %s seconds, closing connection",
+                    self._server_url,
+                    interval,
+                )
+                # Shield the close, as the receive loop cancels this task
+                await asyncio.shield(client.close())
+                return
+
+    async def _wait_for_pong(self, interval: float) -> bool:
+        """Return if a pong is received within the interval.
+
+        Time while the receive loop is blocked does not count.
+        """
+        while True:
+            await self._receiving.wait()
+            try:
+                async with asyncio.timeout(interval):
+                    await self._pong_received.wait()
+            except TimeoutError:
+                if self._receiving.is_set():
+                    return False
+            else:
+                return True
+
+    def _process_pong(self) -> None:
+        """Measure the latency of the last ping."""
+        if self._ping_sent is not None:
+            self._latency = time.monotonic() - self._ping_sent
+            self._ping_sent = None
+        self._pong_received.set()
+
+    async def _reconnect_with_backoff(self, backoff: BackoffPolicy) -> None:
+        """Reconnect until it succeeds."""
+        attempt = 0
+        while True:
+            attempt += 1
+            await asyncio.sleep(backoff.delay(attempt))
+            try:
+                async with self._connect_lock:
+                    if not self.connected:
+                        await self._open()
+            except (ClientError, TimeoutError) as err:
+                _LOGGER.debug("Reconnect attempt %s failed: %s", attempt, err)
+            else:
+                return
+
+    def _set_state(self, state: ConnectionState) -> None:
+        """Set the state and notify the callback."""
+        old_state = self._state
+        self._state = state
+        if old_state is state:
+            return
+        _LOGGER.debug("Connection changed from %s to %s", old_state, state)
+        if self._on_state_change is not None:
+            try:
+                self._on_state_change(old_state, state)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error on connection state callback")
+
+    async def _wait_for_blocking_queues(self) -> None:
+        """Wait until the blocking queues have room for the next message."""
+        for queue in (*self._queues, *self._iterator_queues):
+            if queue.overflow is OverflowPolicy.BLOCK:
+                self._receiving.clear()
+                try:
+                    await queue.wait_for_room()
+                finally:
+                    self._receiving.set()
 
+    @overload
     def subscribe(
-        self, callback: Callable[[ReceiveMessages], None]
+        self,
+        callback: Callable[[ReceiveMessages], None],
+        *,
+        queue: MessageQueue[ReceiveMessages] | None = None,
+    ) -> Callable[[], None]: ...
+
+    @overload
+    def subscribe[T: ReceiveMessages](
+        self,
+        callback: Callable[[T], None],
+        message_type: type[T],
+        *,
+        queue: MessageQueue[T] | None = None,
+    ) -> Callable[[], None]: ...
+
+    def subscribe(
+        self,
+        callback: Callable[[Any], None],
+        message_type: type[Any] | None = None,
+        *,
+        queue: MessageQueue[Any] | None = None,
     ) -> Callable[[], None]:
-        """Subscribe to messages."""
+        """Subscribe to messages.
+
+        If message_type is given, the callback only receives messages of it.
+        If a queue is given, the messages are queued and the callback is called
+        from a separate task, so a slow callback does not delay the receive loop.
+        """
+        if message_type is None:
+            subscribers = self._subscribers
+        else:
+            subscribers = self._handlers.setdefault(message_type, [])
+
+        handler = callback
+        task: asyncio.Task[None] | None = None
+        if queue is not None:
+            handler = queue.put_nowait
+            self._queues.add(queue)
+            task = asyncio.create_task(_deliver(queue, callback))
+            self._delivery_tasks.add(task)
+            task.add_done_callback(self._delivery_tasks.discard)
 
         def _unsubscribe() -> None:
-            self._subscribers.remove(callback)
+            subscribers.remove(handler)
+            if message_type is not None and not subscribers:
+                del self._handlers[message_type]
+            if queue is not None and task is not None:
+                self._queues.discard(queue)
+                queue.close()
+                task.cancel()
 
-        self._subscribers.append(callback)
+        subscribers.append(handler)
         return _unsubscribe
+
+    @overload
+    def messages(
+        self, *, maxsize: int = ..., overflow: OverflowPolicy = ...
+    ) -> AsyncGenerator[ReceiveMessages, None]: ...
+
+    @overload
+    def messages[T: ReceiveMessages](
+        self,
+        *message_types: type[T],
+        maxsize: int = ...,
+        overflow: OverflowPolicy = ...,
+    ) -> AsyncGenerator[T, None]: ...
+
+    async def messages(
+        self,
+        *message_types: type[Any],
+        maxsize: int = 100,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> AsyncGenerator[ReceiveMessages, None]:
+        """Iterate over the received messages of the given types or all messages.
+
+        The messages are buffered in a queue of maxsize messages and the
+        overflow policy applies while it is full. The iteration ends when the
+        connection is closed.
+        """
+        queue: MessageQueue[ReceiveMessages] = MessageQueue(
+            maxsize=maxsize, overflow=overflow
+        )
+        unsubscribers = (
+            [
+                self.subscribe(queue.put_nowait, message_type)
+                for message_type in message_types
+            ]
+            if message_types
+            else [self.subscribe(queue.put_nowait)]
+        )
+        self._iterator_queues.add(queue)
+        try:
+            async for message in queue:
+                yield message
+        finally:
+            self._iterator_queues.discard(queue)
+            queue.close()
+            for unsubscribe in unsubscribers:
+                unsubscribe()
+
+
+def _candidate_to_json(candidate: str) -> str:
+    """Serialize a candidate message without the dataclass serializer."""
+    return orjson.dumps({"value": candidate, "type": WebRTCCandidate.TYPE}).decode()
+
+
+async def _deliver[T](queue: MessageQueue[T], callback: Callable[[T], None]) -> None:
+    """Call the callback with the queued messages."""
+    async for message in queue:
+        try:
+            callback(message)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error on subscriber callback")
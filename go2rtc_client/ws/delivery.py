@@ -0,0 +1,120 @@
+"""Queued delivery of websocket messages."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+import logging
+from typing import Self
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OverflowPolicy(StrEnum):
+    """What to do with a message if the queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    BLOCK = "block"
+
+
+@dataclass(slots=True)
+class DeliveryStats:
+    """Delivery statistics of a message queue."""
+
+    queued: int = 0
+    dropped: int = 0
+
+
+class MessageQueue[T]:
+    """Bounded message queue between the receive loop and a consumer.
+
+    If the queue is full, DROP_OLDEST discards the oldest queued message and
+    DROP_NEWEST the new message. With BLOCK the receive loop stops reading from
+    the connection until the consumer made room again.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 100,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> None:
+        """Initialize queue."""
+        if maxsize < 1:
+            msg = "Max size must be at least 1"
+            raise ValueError(msg)
+        self._maxsize = maxsize
+        self.overflow = overflow
+        self._messages: deque[T] = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._closed = False
+        self.stats = DeliveryStats()
+
+    def __len__(self) -> int:
+        """Return the number of queued messages."""
+        return len(self._messages)
+
+    @property
+    def closed(self) -> bool:
+        """Return if the queue is closed."""
+        return self._closed
+
+    def put_nowait(self, message: T) -> None:
+        """Queue a message and apply the overflow policy."""
+        if self._closed:
+            return
+        if len(self._messages) >= self._maxsize:
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped += 1
+                _LOGGER.debug("Message queue is full, dropping %s", message)
+                return
+            if self.overflow is OverflowPolicy.DROP_OLDEST:
+                dropped = self._messages.popleft()
+                self.stats.dropped += 1
+                _LOGGER.debug("Message queue is full, dropping %s", dropped)
+        self._messages.append(message)
+        self.stats.queued += 1
+        self._readable.set()
+        if (
+            self.overflow is OverflowPolicy.BLOCK
+            and len(self._messages) >= self._maxsize
+        ):
+            self._writable.clear()
+
+    async def wait_for_room(self) -> None:
+        """Wait until a message can be queued without blocking."""
+        await self._writable.wait()
+
+    async def get(self) -> T:
+        """Return the next message.
+
+        Raise StopAsyncIteration if the queue is closed and drained.
+        """
+        while not self._messages:
+            if self._closed:
+                raise StopAsyncIteration
+            self._readable.clear()
+            await self._readable.wait()
+        message = self._messages.popleft()
+        if len(self._messages) < self._maxsize:
+            self._writable.set()
+        return message
+
+    def close(self) -> None:
+        """Close the queue, the queued messages can still be consumed."""
+        self._closed = True
+        self._readable.set()
+        self._writable.set()
+
+    def __aiter__(self) -> Self:
+        """Return the iterator."""
+        return self
+
+    async def __anext__(self) -> T:
+        """Return the next message."""
+        return await self.get()
@@ -3,16 +3,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Annotated, Any, ClassVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, Annotated, Any, ClassVar, Final
 
 from mashumaro import field_options
 from mashumaro.config import BaseConfig
 from mashumaro.mixins.orjson import DataClassORJSONMixin
 from mashumaro.types import Discriminator
+import orjson
 from webrtc_models import (
-    RTCIceServer,  # noqa: TC002 # Mashumaro needs the import to generate the correct code
+    RTCIceServer,  # Mashumaro needs the import to generate the correct code
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 @dataclass(frozen=True)
 class WsMessage:
@@ -79,20 +84,41 @@ class WebRTCOffer(WebRTCValue):
     TYPE = "offer"
     ice_servers: list[RTCIceServer]
 
-    def __pre_serialize__(self) -> WebRTCOffer:
-        """Pre serialize.
+    def __post_serialize__(self, d: dict[Any, Any]) -> dict[Any, Any]:
+        """Post serialize.
 
         Go2rtc supports only ice_servers with urls as list of strings.
         """
-        for server in self.ice_servers:
-            if isinstance(server.urls, str):
-                server.urls = [server.urls]
-
-        return self
+        for server in d["ice_servers"]:
+            if isinstance(server["urls"], str):
+                server["urls"] = [server["urls"]]
+        return super().__post_serialize__(d)
 
     def to_json(self, **kwargs: Any) -> str:
-        """Convert to json."""
-        return WebRTC(self).to_json(**kwargs)
+        """Convert to json.
+
+        The serialized ice servers are cached, as they rarely change.
+        """
+        if kwargs:
+            return WebRTC(self).to_json(**kwargs)
+        key = tuple(
+            (
+                (server.urls,) if isinstance(server.urls, str) else tuple(server.urls),
+                server.username,
+                server.credential,
+            )
+            for server in self.ice_servers
+        )
+        return orjson.dumps(
+            {
+                "value": {
+                    "sdp": self.sdp,
+                    "ice_servers": _ice_servers_fragment(key),
+                    "type": self.TYPE,
+                },
+                "type": WebRTC.TYPE,
+            }
+        ).decode()
 
 
 @dataclass(frozen=True)
@@ -110,5 +136,70 @@ class WsError(BaseMessage):
     error: str = field(metadata=field_options(alias="value"))
 
 
+type _IceServersKey = tuple[tuple[tuple[str, ...], str | None, str | None], ...]
+
+
+@lru_cache(maxsize=16)
+def _ice_servers_fragment(key: _IceServersKey) -> orjson.Fragment:
+    """Return the serialized ice servers with urls as list."""
+    return orjson.Fragment(
+        orjson.dumps(
+            [
+                RTCIceServer(list(urls), username, credential).to_dict()
+                for urls, username, credential in key
+            ]
+        )
+    )
+
+
 ReceiveMessages = WebRTCAnswer | WebRTCCandidate | WsError
 SendMessages = WebRTCCandidate | WebRTCOffer
+
+
+def _decode_candidate(data: dict[str, Any]) -> WebRTCCandidate | None:
+    """Decode a candidate message."""
+    if isinstance(value := data.get("value"), str):
+        return WebRTCCandidate(value)
+    return None
+
+
+def _decode_webrtc(data: dict[str, Any]) -> WebRTCAnswer | None:
+    """Decode a WebRTC answer without the WebRTC wrapper."""
+    value = data.get("value")
+    if (
+        isinstance(value, dict)
+        and value.get("type") == WebRTCAnswer.TYPE
+        and isinstance(sdp := value.get("sdp"), str)
+    ):
+        return WebRTCAnswer(sdp)
+    return None
+
+
+def _decode_error(data: dict[str, Any]) -> WsError | None:
+    """Decode an error message."""
+    if isinstance(value := data.get("value"), str):
+        return WsError(value)
+    return None
+
+
+_DECODERS: Final[dict[str, Callable[[dict[str, Any]], WsMessage | None]]] = {
+    WebRTCCandidate.TYPE: _decode_candidate,
+    WebRTC.TYPE: _decode_webrtc,
+    WsError.TYPE: _decode_error,
+}
+
+
+def decode_message(data: str | bytes) -> WsMessage:
+    """Decode a received message.
+
+    The received message types are looked up by their type field and built
+    directly. Anything else falls back to the discriminator of BaseMessage.
+    """
+    message = orjson.loads(data)
+    if (
+        isinstance(message, dict)
+        and (decoder := _DECODERS.get(message.get("type"))) is not None  # type: ignore[arg-type]
+        and (decoded := decoder(message)) is not None
+    ):
+        return decoded
+    return BaseMessage.from_dict(message)
@@ -0,0 +1,174 @@
+"""Bounded websocket connections for many WebRTC sessions."""
+
+from __future__ import annotations
+
+import asyncio
+from enum import StrEnum
+from typing import TYPE_CHECKING, Self
+
+from .client import Go2RtcWsClient
+from .messages import WebRTCAnswer, WebRTCOffer, WsError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from aiohttp import ClientSession
+
+    from .messages import ReceiveMessages, SendMessages
+
+
+class SessionState(StrEnum):
+    """State of a pooled WebRTC session."""
+
+    NEW = "new"
+    OFFER_SENT = "offer_sent"
+    ANSWERED = "answered"
+    FAILED = "failed"
+    RELEASED = "released"
+
+
+class Go2RtcWsSession:
+    """WebRTC session with its own connection of a Go2RtcWsPool.
+
+    Messages received on the connection are routed to the subscribers of the
+    session. The connection is closed when the session is released.
+    """
+
+    def __init__(self, pool: Go2RtcWsPool, client: Go2RtcWsClient) -> None:
+        """Initialize session."""
+        self._pool = pool
+        self._client = client
+        self._state = SessionState.NEW
+        self._unsubscribers = [client.subscribe(self._on_message)]
+
+    @property
+    def state(self) -> SessionState:
+        """Return the session state."""
+        return self._state
+
+    async def send(self, message: SendMessages) -> None:
+        """Send a message."""
+        if self._state is SessionState.RELEASED:
+            msg = "Session already released"
+            raise RuntimeError(msg)
+        await self._client.send(message)
+        if isinstance(message, WebRTCOffer):
+            self._state = SessionState.OFFER_SENT
+
+    def subscribe(
+        self, callback: Callable[[ReceiveMessages], None]
+    ) -> Callable[[], None]:
+        """Subscribe to the messages of this session."""
+        unsubscribe = self._client.subscribe(callback)
+        self._unsubscribers.append(unsubscribe)
+
+        def _unsubscribe() -> None:
+            self._unsubscribers.remove(unsubscribe)
+            unsubscribe()
+
+        return _unsubscribe
+
+    async def release(self) -> None:
+        """Release the session and close its connection."""
+        if self._state is SessionState.RELEASED:
+            return
+        self._state = SessionState.RELEASED
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers.clear()
+        await self._pool.release(self._client)
+
+    async def __aenter__(self) -> Self:
+        """Enter the session."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Release the session."""
+        await self.release()
+
+    def _on_message(self, message: ReceiveMessages) -> None:
+        """Track the session state."""
+        if isinstance(message, WebRTCAnswer):
+            self._state = SessionState.ANSWERED
+        elif isinstance(message, WsError):
+            self._state = SessionState.FAILED
+
+
+class Go2RtcWsPool:
+    """Bound the number of websocket connections to a go2rtc server.
+
+    go2rtc does not tag answers and candidates with a session id, so a
+    connection cannot be shared by several sessions and late messages of a
+    released session could reach the next one. Each session therefore opens
+    its own connection, which is closed on release. Acquiring waits while
+    max_connections sessions are active and raises TimeoutError if no
+    connection became available within acquire_timeout seconds.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        server_url: str,
+        *,
+        max_connections: int = 100,
+        acquire_timeout: float | None = 30.0,
+    ) -> None:
+        """Initialize pool."""
+        if max_connections < 1:
+            msg = "Max connections must be at least 1"
+            raise ValueError(msg)
+        self._session = session
+        self._server_url = server_url
+        self._max_connections = max_connections
+        self._acquire_timeout = acquire_timeout
+        self._active = 0
+        self._condition = asyncio.Condition()
+        self._closed = False
+
+    @property
+    def active(self) -> int:
+        """Return the number of connections used by sessions."""
+        return self._active
+
+    async def acquire(
+        self, *, source: str | None = None, destination: str | None = None
+    ) -> Go2RtcWsSession:
+        """Acquire a session for a source or destination."""
+        client = Go2RtcWsClient(
+            self._session, self._server_url, source=source, destination=destination
+        )
+        async with asyncio.timeout(self._acquire_timeout), self._condition:
+            while self._active >= self._max_connections and not self._closed:
+                await self._condition.wait()
+            if self._closed:
+                msg = "Pool is closed"
+                raise RuntimeError(msg)
+            self._active += 1
+        try:
+            await client.connect()
+        except BaseException:
+            await self._free_slot()
+            raise
+        return Go2RtcWsSession(self, client)
+
+    async def release(self, client: Go2RtcWsClient) -> None:
+        """Close the connection of a session and free its slot."""
+        try:
+            await client.close()
+        finally:
+            await self._free_slot()
+
+    async def close(self) -> None:
+        """Stop acquiring, waiting acquires raise.
+
+        Active sessions keep their connection until they are released.
+        """
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    async def _free_slot(self) -> None:
+        """Free the slot of a connection and wake a waiting acquire."""
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify()
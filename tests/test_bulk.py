@@ -0,0 +1,85 @@
+"""Tests for the bulk helpers."""
+
+import asyncio
+
+import pytest
+
+from go2rtc_client.bulk import BulkResult, bounded_as_completed
+
+
+async def test_bounded_concurrency() -> None:
+    """Test no more than the given number of keys run at once."""
+    running = 0
+    max_running = 0
+
+    async def func(key: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return key * 2
+
+    results = [
+        result async for result in bounded_as_completed(range(10), func, concurrency=3)
+    ]
+
+    assert max_running == 3
+    assert sorted(result.value for result in results if result.value) == [
+        key * 2 for key in range(1, 10)
+    ]
+    assert all(result.ok for result in results)
+
+
+async def test_errors_and_timeouts_reported_per_key() -> None:
+    """Test a failing key does not fail the other keys."""
+
+    async def func(key: str) -> str:
+        if key == "error":
+            raise ValueError(key)
+        if key == "slow":
+            await asyncio.sleep(1)
+        return key
+
+    results = {
+        result.key: result
+        async for result in bounded_as_completed(
+            ["ok", "error", "slow"], func, concurrency=3, item_timeout=0.05
+        )
+    }
+
+    assert results["ok"] == BulkResult("ok", value="ok")
+    assert isinstance(results["error"].error, ValueError)
+    assert not results["error"].ok
+    assert isinstance(results["slow"].error, TimeoutError)
+
+
+async def test_close_cancels_pending() -> None:
+    """Test closing the iterator cancels the pending keys."""
+    cancelled: list[int] = []
+
+    async def func(key: int) -> int:
+        if key:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(key)
+                raise
+        return key
+
+    results = bounded_as_completed(range(3), func, concurrency=3)
+    assert await anext(results) == BulkResult(0, value=0)
+    await results.aclose()
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == [1, 2]
+
+
+async def test_invalid_concurrency() -> None:
+    """Test concurrency must be at least 1."""
+
+    async def func(key: int) -> int:
+        return key
+
+    with pytest.raises(ValueError, match="Concurrency must be at least 1"):
+        await anext(bounded_as_completed([1], func, concurrency=0))
@@ -0,0 +1,142 @@
+"""Tests for the snapshot cache."""
+
+import asyncio
+
+import pytest
+
+from go2rtc_client.cache import CacheStats, SnapshotCache
+
+
+class _Fetcher:
+    """Fetch callable counting the calls."""
+
+    def __init__(self, image: bytes = b"image") -> None:
+        """Initialize fetcher."""
+        self.image = image
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> bytes:
+        """Return the image."""
+        self.calls += 1
+        await self.release.wait()
+        return self.image
+
+
+async def test_hit_and_miss() -> None:
+    """Test cached snapshots are returned."""
+    cache = SnapshotCache(ttl=60)
+    fetch = _Fetcher()
+
+    assert await cache.get(("cam", None, None), fetch) == b"image"
+    assert await cache.get(("cam", None, None), fetch) == b"image"
+    assert await cache.get(("cam", 100, None), fetch) == b"image"
+
+    assert fetch.calls == 2
+    assert len(cache) == 2
+    assert cache.stats == CacheStats(hits=1, misses=2, coalesced=0)
+
+
+async def test_coalescing() -> None:
+    """Test concurrent lookups share a single fetch."""
+    cache = SnapshotCache(ttl=60)
+    fetch = _Fetcher()
+    fetch.release.clear()
+
+    tasks = [
+        asyncio.create_task(cache.get(("cam", None, None), fetch)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    fetch.release.set()
+
+    assert await asyncio.gather(*tasks) == [b"image"] * 3
+    assert fetch.calls == 1
+    assert cache.stats == CacheStats(hits=0, misses=1, coalesced=2)
+
+
+async def test_cancelled_caller_does_not_cancel_fetch() -> None:
+    """Test a cancelled caller does not cancel the shared fetch."""
+    cache = SnapshotCache(ttl=60)
+    fetch = _Fetcher()
+    fetch.release.clear()
+
+    first = asyncio.create_task(cache.get(("cam", None, None), fetch))
+    second = asyncio.create_task(cache.get(("cam", None, None), fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    fetch.release.set()
+
+    assert await second == b"image"
+    assert first.cancelled()
+
+
+async def test_ttl_expired(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test expired snapshots are fetched again."""
+    now = 1000.0
+    monkeypatch.setattr("go2rtc_client.cache.time.monotonic", lambda: now)
+    cache = SnapshotCache(ttl=1)
+    fetch = _Fetcher()
+
+    await cache.get(("cam", None, None), fetch)
+    now += 2
+    await cache.get(("cam", None, None), fetch)
+
+    assert fetch.calls == 2
+    assert cache.stats == CacheStats(hits=0, misses=2, coalesced=0)
+
+
+async def test_lru_eviction() -> None:
+    """Test the least recently used snapshot is evicted."""
+    cache = SnapshotCache(ttl=60, max_entries=2)
+    fetch = _Fetcher()
+
+    await cache.get(("a", None, None), fetch)
+    await cache.get(("b", None, None), fetch)
+    await cache.get(("a", None, None), fetch)
+    await cache.get(("c", None, None), fetch)
+    await cache.get(("a", None, None), fetch)
+    await cache.get(("b", None, None), fetch)
+
+    assert fetch.calls == 4
+    assert len(cache) == 2
+
+
+async def test_error_not_cached() -> None:
+    """Test failed fetches are not cached."""
+    cache = SnapshotCache(ttl=60)
+
+    async def fail() -> bytes:
+        raise ValueError
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        await cache.get(("cam", None, None), fail)
+
+    assert len(cache) == 0
+    assert await cache.get(("cam", None, None), _Fetcher()) == b"image"
+
+
+async def test_invalidate_and_clear() -> None:
+    """Test removing snapshots from the cache."""
+    cache = SnapshotCache(ttl=60)
+    fetch = _Fetcher()
+    await cache.get(("a", None, None), fetch)
+    await cache.get(("b", None, None), fetch)
+
+    cache.invalidate(("a", None, None))
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"ttl": 0}, "TTL must be greater than 0"),
+        ({"max_entries": 0}, "Max entries must be at least 1"),
+    ],
+)
+def test_invalid_arguments(kwargs: dict[str, float], message: str) -> None:
+    """Test invalid arguments raise."""
+    with pytest.raises(ValueError, match=message):
+        SnapshotCache(**kwargs)  # type: ignore[arg-type]
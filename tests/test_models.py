@@ -0,0 +1,102 @@
+"""Tests for the models."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from go2rtc_client.models import (
+    ApplicationInfo,
+    Preload,
+    PreloadConfig,
+    Producer,
+    Stream,
+)
+
+
+@pytest.mark.parametrize(
+    ("model", "attribute"),
+    [
+        (ApplicationInfo.from_dict({"version": "1.9.13"}), "version"),
+        (Preload("video&audio"), "query"),
+        (Producer("rtsp://camera"), "url"),
+        (Stream([Producer("rtsp://camera")]), "producers"),
+    ],
+    ids=["application info", "preload", "producer", "stream"],
+)
+def test_compact_models(model: object, attribute: str) -> None:
+    """Test the models are slot based and frozen."""
+    assert not hasattr(model, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        setattr(model, attribute, None)
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("video&audio", PreloadConfig()),
+        ("video", PreloadConfig(audio_codec_filter=None)),
+        ("", PreloadConfig(None, None, None)),
+        ("video=h264&audio", PreloadConfig(video_codec_filter=("h264",))),
+        (
+            "video=H264,h265&audio=opus&microphone=pcmu",
+            PreloadConfig(("h264", "h265"), ("opus",), ("pcmu",)),
+        ),
+        ("video=h264&video=h265&video=h264", PreloadConfig(("h264", "h265"), None)),
+        ("video=h264%2Ch265&mp4=flac", PreloadConfig(("h264", "h265"), None)),
+        ("video&audio=OPUS/48000/2", PreloadConfig((), ("opus/48000/2",))),
+        ("audio=opus%3D1&microphone", PreloadConfig(None, ("opus=1",), ())),
+    ],
+    ids=[
+        "no filters",
+        "video only",
+        "empty",
+        "video",
+        "all",
+        "repeated",
+        "encoded",
+        "clock rate",
+        "unknown",
+    ],
+)
+def test_preload_config(query: str, expected: PreloadConfig) -> None:
+    """Test the codec filters are parsed from the preload query."""
+    assert Preload(query).config == expected
+
+
+def test_preload_config_media() -> None:
+    """Test absent media is not the same as media with any codec."""
+    assert Preload("video").config != Preload("video&audio").config
+    assert Preload("video&audio").config != Preload("").config
+    assert Preload("video&audio&microphone").config != Preload("video&audio").config
+
+
+def test_preload_config_normalized() -> None:
+    """Test equal codec filters compare equal."""
+    config = PreloadConfig((" H264", "h265", "h264"), (), None)
+
+    assert config == PreloadConfig(("h264", "h265"))
+    assert config.params == {"video_codec_filter": "h264,h265"}
+    # The order of preference is kept
+    assert config != PreloadConfig(("h265", "h264"))
+
+
+@pytest.mark.parametrize("codec", ["", "h264,h265", "h264&audio", "h264=1"])
+def test_preload_config_invalid(codec: str) -> None:
+    """Test codecs which would break the query are rejected."""
+    config = PreloadConfig(audio_codec_filter=(codec,))
+
+    with pytest.raises(ValueError, match="Invalid codec"):
+        _ = config.params
+
+
+def test_preload_config_from_codecs() -> None:
+    """Test the config of codec lists."""
+    assert PreloadConfig.from_codecs() == PreloadConfig()
+    assert PreloadConfig.from_codecs([], [], []) == PreloadConfig()
+    config = PreloadConfig.from_codecs(audio=["OPUS/48000"], microphone=["pcmu"])
+
+    assert config == PreloadConfig((), ("opus/48000",), ("pcmu",))
+    assert config.params == {
+        "audio_codec_filter": "opus/48000",
+        "microphone_codec_filter": "pcmu",
+    }
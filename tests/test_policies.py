@@ -0,0 +1,141 @@
+"""Tests for the policies."""
+
+import logging
+
+from aiohttp import ClientConnectionError, ClientResponseError, RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+import pytest
+from yarl import URL
+
+from go2rtc_client.exceptions import Go2RtcCircuitOpenError
+from go2rtc_client.policies import (
+    BackoffPolicy,
+    CircuitBreaker,
+    CircuitState,
+    RetryBudget,
+    RetryPolicy,
+)
+
+
+def _response_error(status: int) -> ClientResponseError:
+    """Return a response error with the given status."""
+    return ClientResponseError(
+        RequestInfo(URL(), "GET", CIMultiDictProxy(CIMultiDict()), URL()),
+        (),
+        status=status,
+    )
+
+
+@pytest.mark.parametrize(
+    ("attempt", "expected"),
+    [(1, 0.5), (2, 1.0), (3, 2.0), (10, 5.0)],
+)
+def test_backoff_without_jitter(attempt: int, expected: float) -> None:
+    """Test the exponential backoff is capped."""
+    backoff = BackoffPolicy(initial=0.5, maximum=5, jitter=False)
+    assert backoff.delay(attempt) == expected
+
+
+def test_backoff_with_jitter() -> None:
+    """Test the jittered backoff stays within the exponential delay."""
+    backoff = BackoffPolicy(initial=1, maximum=5)
+    for attempt in range(1, 6):
+        assert 0 <= backoff.delay(attempt) <= min(5, 2 ** (attempt - 1))
+
+
+def test_retry_budget() -> None:
+    """Test the budget limits the retries."""
+    budget = RetryBudget(ratio=0.5, max_tokens=2)
+
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2
+
+
+@pytest.mark.parametrize(
+    ("err", "expected"),
+    [
+        (ClientConnectionError(), True),
+        (TimeoutError(), True),
+        (_response_error(503), True),
+        (_response_error(404), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_retryable(err: Exception, expected: bool) -> None:
+    """Test which errors are retried."""
+    assert RetryPolicy().is_retryable(err) is expected
+
+
+def test_circuit_breaker(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the circuit breaker state transitions."""
+    now = 1000.0
+    monkeypatch.setattr("go2rtc_client.policies.time.monotonic", lambda: now)
+    transitions: list[tuple[CircuitState, CircuitState]] = []
+    breaker = CircuitBreaker(
+        failure_threshold=2,
+        reset_timeout=10,
+        on_state_change=lambda old, new: transitions.append((old, new)),
+    )
+
+    assert breaker.before_request() is False
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    with pytest.raises(Go2RtcCircuitOpenError):
+        breaker.before_request()
+
+    now += 10
+    assert breaker.before_request() is True
+    assert breaker.state is CircuitState.HALF_OPEN
+    # Only a single probe is allowed
+    with pytest.raises(Go2RtcCircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    now += 10
+    assert breaker.before_request() is True
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+    assert transitions == [
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+
+
+def test_circuit_breaker_callback_raised(caplog: pytest.LogCaptureFixture) -> None:
+    """Test an exception raised by the callback is logged."""
+
+    def on_state_change(_: CircuitState, __: CircuitState) -> None:
+        raise ValueError
+
+    breaker = CircuitBreaker(failure_threshold=1, on_state_change=on_state_change)
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    assert caplog.record_tuples == [
+        (
+            "go2rtc_client.policies",
+            logging.ERROR,
+            "Error on circuit state callback",
+        )
+    ]
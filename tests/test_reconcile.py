@@ -0,0 +1,243 @@
+"""Tests for the reconciler."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import yarl
+
+from go2rtc_client import (
+    ActionKind,
+    DesiredState,
+    PreloadConfig,
+    ReconcileAction,
+    Reconciler,
+)
+from go2rtc_client.exceptions import Go2RtcClientError
+from go2rtc_client.rest import _PreloadClient, _StreamClient
+
+from . import URL
+
+if TYPE_CHECKING:
+    from aiointercept import aiointercept
+
+    from go2rtc_client import Go2RtcRestClient
+
+STREAMS_URL = f"{URL}{_StreamClient.PATH}"
+PRELOAD_URL = f"{URL}{_PreloadClient.PATH}"
+
+DESIRED = DesiredState(
+    streams={
+        "camera.same": "rtsp://same",
+        "camera.changed": ["rtsp://new"],
+        "camera.new": "rtsp://camera.new",
+    },
+    preloads={
+        "camera.same": PreloadConfig(),
+        "camera.new": PreloadConfig(video_codec_filter=("h264",)),
+    },
+)
+
+
+def _mock_state(responses: aiointercept) -> None:
+    """Mock the current streams and preloads."""
+    streams = {
+        "camera.same": {"producers": [{"url": "rtsp://same"}]},
+        "camera.changed": {"producers": [{"url": "rtsp://old"}]},
+        "camera.unmanaged": {"producers": [{"url": "rtsp://unmanaged"}]},
+    }
+    preloads = {
+        "camera.same": {"query": "video&audio"},
+        "camera.unmanaged": {"query": "video&audio"},
+    }
+    responses.get(STREAMS_URL, status=200, body=json.dumps(streams))
+    responses.get(PRELOAD_URL, status=200, body=json.dumps(preloads))
+
+
+EXPECTED_ACTIONS = [
+    ReconcileAction(ActionKind.UPDATE_STREAM, "camera.changed", ("rtsp://new",)),
+    ReconcileAction(ActionKind.ADD_STREAM, "camera.new", ("rtsp://camera.new",)),
+    ReconcileAction(
+        ActionKind.ENABLE_PRELOAD,
+        "camera.new",
+        preload=PreloadConfig(video_codec_filter=("h264",)),
+    ),
+]
+
+
+async def test_dry_run(responses: aiointercept, rest_client: Go2RtcRestClient) -> None:
+    """Test a dry run only plans the actions."""
+    _mock_state(responses)
+
+    result = await Reconciler(rest_client).reconcile(DESIRED, dry_run=True)
+
+    assert result.actions == EXPECTED_ACTIONS
+    assert result.results == []
+    assert result.ok
+    assert responses.call_count == 2
+
+
+async def test_reconcile(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test only the needed changes are applied."""
+    _mock_state(responses)
+    responses.patch(
+        str(
+            yarl.URL(STREAMS_URL).with_query(
+                {"name": "camera.changed", "src": "rtsp://new"}
+            )
+        ),
+        status=200,
+    )
+    responses.put(
+        str(
+            yarl.URL(STREAMS_URL).with_query(
+                {"name": "camera.new", "src": "rtsp://camera.new"}
+            )
+        ),
+        status=200,
+    )
+    responses.put(
+        str(
+            yarl.URL(PRELOAD_URL).with_query(
+                {"src": "camera.new", "video_codec_filter": "h264"}
+            )
+        ),
+        status=500,
+    )
+
+    result = await Reconciler(rest_client, concurrency=2).reconcile(DESIRED)
+
+    assert result.actions == EXPECTED_ACTIONS
+    assert sorted(r.key.name for r in result.results if r.ok) == [
+        "camera.changed",
+        "camera.new",
+    ]
+    failed = [r for r in result.results if not r.ok]
+    assert [r.key for r in failed] == [EXPECTED_ACTIONS[-1]]
+    assert isinstance(failed[0].error, Go2RtcClientError)
+    assert not result.ok
+    assert responses.call_count == 5
+
+
+async def test_update_multiple_sources(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test a stream with several sources is replaced instead of patched."""
+    _mock_state(responses)
+    query = [("name", "camera.changed"), ("src", "rtsp://new"), ("src", "rtsp://2")]
+    responses.put(str(yarl.URL(STREAMS_URL).with_query(query)), status=200)
+
+    result = await Reconciler(rest_client).reconcile(
+        DesiredState(
+            streams={
+                "camera.same": "rtsp://same",
+                "camera.changed": ["rtsp://new", "rtsp://2"],
+            }
+        )
+    )
+
+    assert result.actions == [
+        ReconcileAction(
+            ActionKind.UPDATE_STREAM, "camera.changed", ("rtsp://new", "rtsp://2")
+        )
+    ]
+    assert result.ok
+    assert responses.call_count == 3
+
+
+async def test_streams_only_keeps_preloads(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test preloads are left alone if they are not desired without pruning."""
+    _mock_state(responses)
+
+    actions = await Reconciler(rest_client).plan(
+        DesiredState(
+            streams={"camera.same": "rtsp://same", "camera.changed": "rtsp://old"}
+        )
+    )
+
+    assert actions == []
+
+
+async def test_nothing_to_do(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test no changes are applied if the state matches."""
+    _mock_state(responses)
+
+    result = await Reconciler(rest_client).reconcile(
+        DesiredState(
+            streams={"camera.same": "rtsp://same"},
+            preloads={
+                "camera.same": PreloadConfig(),
+                "camera.unmanaged": PreloadConfig(),
+            },
+        )
+    )
+
+    assert result.actions == []
+    assert result.ok
+
+
+async def test_preload_filters_changed(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test a preload is enabled again if its codec filters differ."""
+    responses.get(STREAMS_URL, status=200, body="{}")
+    responses.get(
+        PRELOAD_URL,
+        status=200,
+        body=json.dumps(
+            {
+                "camera.same": {"query": "video=H264&audio"},
+                "camera.changed": {"query": "video=h264&audio=opus"},
+                "camera.video": {"query": "video"},
+            }
+        ),
+    )
+
+    actions = await Reconciler(rest_client).plan(
+        DesiredState(
+            preloads={
+                "camera.same": PreloadConfig(video_codec_filter=("h264",)),
+                "camera.changed": PreloadConfig(video_codec_filter=("h264",)),
+                "camera.video": PreloadConfig(),
+            }
+        )
+    )
+
+    assert actions == [
+        ReconcileAction(
+            ActionKind.ENABLE_PRELOAD,
+            "camera.changed",
+            preload=PreloadConfig(video_codec_filter=("h264",)),
+        ),
+        ReconcileAction(
+            ActionKind.ENABLE_PRELOAD, "camera.video", preload=PreloadConfig()
+        ),
+    ]
+
+
+async def test_prune(responses: aiointercept, rest_client: Go2RtcRestClient) -> None:
+    """Test streams which are not desired are deleted if pruning."""
+    _mock_state(responses)
+    responses.delete(f"{STREAMS_URL}?src=camera.unmanaged", status=200)
+    responses.delete(f"{PRELOAD_URL}?src=camera.unmanaged", status=200)
+
+    result = await Reconciler(rest_client, prune=True).reconcile(
+        DesiredState(
+            streams={"camera.same": "rtsp://same", "camera.changed": "rtsp://old"},
+            preloads={"camera.same": PreloadConfig()},
+        )
+    )
+
+    assert result.actions == [
+        ReconcileAction(ActionKind.DELETE_STREAM, "camera.unmanaged"),
+        ReconcileAction(ActionKind.DISABLE_PRELOAD, "camera.unmanaged"),
+    ]
+    assert result.ok
+    assert len(result.results) == 2
@@ -0,0 +1,121 @@
+"""Tests for the stream registry."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+from typing import TYPE_CHECKING, Any
+
+from go2rtc_client.models import Producer, Stream
+from go2rtc_client.registry import StreamChange, StreamRegistry, StreamsDiff
+from go2rtc_client.rest import _StreamClient
+
+from . import URL
+
+if TYPE_CHECKING:
+    from aiointercept import aiointercept
+    import pytest
+
+    from go2rtc_client import Go2RtcRestClient
+
+STREAMS_URL = f"{URL}{_StreamClient.PATH}"
+
+
+def _streams(**streams: list[str]) -> str:
+    """Return a streams response."""
+    payload: dict[str, Any] = {
+        name: {"producers": [{"url": url} for url in urls]}
+        for name, urls in streams.items()
+    }
+    return json.dumps(payload)
+
+
+async def test_refresh_diff(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test refreshing returns the changes since the previous listing."""
+    responses.get(STREAMS_URL, body=_streams(a=["rtsp://a"], b=["rtsp://b"]))
+    responses.get(
+        STREAMS_URL,
+        body=_streams(a=["rtsp://a2", "rtsp://a"], c=["rtsp://c"]),
+    )
+    registry = StreamRegistry(rest_client, ttl=60)
+
+    diff = await registry.refresh()
+    assert diff == StreamsDiff(
+        added={
+            "a": Stream([Producer("rtsp://a")]),
+            "b": Stream([Producer("rtsp://b")]),
+        }
+    )
+
+    # Not expired yet
+    assert not await registry.refresh()
+    assert responses.call_count == 1
+
+    diff = await registry.refresh(force=True)
+    assert diff == StreamsDiff(
+        added={"c": Stream([Producer("rtsp://c")])},
+        removed={"b": Stream([Producer("rtsp://b")])},
+        changed={"a": StreamChange(added_producers=[Producer("rtsp://a2")])},
+    )
+    assert set(registry.streams) == {"a", "c"}
+
+
+async def test_list_expired(
+    responses: aiointercept,
+    rest_client: Go2RtcRestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the listing is fetched again once expired."""
+    now = 1000.0
+    monkeypatch.setattr("go2rtc_client.registry.time.monotonic", lambda: now)
+    responses.get(STREAMS_URL, body=_streams(a=["rtsp://a"]))
+    responses.get(STREAMS_URL, body=_streams(a=["rtsp://b"]))
+    registry = StreamRegistry(rest_client, ttl=5)
+
+    assert registry.expired
+    streams = await registry.list()
+    assert streams["a"].producers == [Producer("rtsp://a")]
+    assert not registry.expired
+
+    now += 5
+    streams = await registry.list()
+    assert streams["a"].producers == [Producer("rtsp://b")]
+
+    registry.invalidate()
+    assert registry.expired
+    assert responses.call_count == 2
+
+
+async def test_refresh_coalesced(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test concurrent refreshes share a single request."""
+    responses.get(STREAMS_URL, body=_streams(a=["rtsp://a"]))
+    registry = StreamRegistry(rest_client)
+
+    diffs = await asyncio.gather(*(registry.refresh() for _ in range(3)))
+
+    assert responses.call_count == 1
+    assert all(diff.added.keys() == {"a"} for diff in diffs)
+
+
+async def test_refresh_failed_without_callers(
+    responses: aiointercept,
+    rest_client: Go2RtcRestClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failed refresh without waiting callers is not reported."""
+    responses.get(STREAMS_URL, status=500)
+    registry = StreamRegistry(rest_client)
+
+    caller = asyncio.create_task(registry.refresh())
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.sleep(0.1)
+    gc.collect()
+
+    assert caller.cancelled()
+    assert "Task exception was never retrieved" not in caplog.text
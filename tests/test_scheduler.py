@@ -0,0 +1,266 @@
+"""Tests for the preload scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+import json
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+
+from go2rtc_client import EvictionPolicy, PreloadScheduler
+from go2rtc_client.models import WebRTCSdpOffer
+from go2rtc_client.rest import _API_PREFIX, _PreloadClient, _WebRTCClient
+
+from . import URL, load_fixture_bytes, load_fixture_str
+
+if TYPE_CHECKING:
+    from aiointercept import aiointercept
+
+    from go2rtc_client import Go2RtcRestClient
+
+PRELOAD_URL = f"{URL}{_PreloadClient.PATH}"
+
+
+@pytest.fixture
+def now(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Patch the monotonic clock of the scheduler."""
+    now = [1000.0]
+    monkeypatch.setattr("go2rtc_client.scheduler.time.monotonic", lambda: now[0])
+    return now
+
+
+def _access(scheduler: PreloadScheduler, *names: str) -> None:
+    """Record an access of each name."""
+    for name in names:
+        scheduler.record_access(name)
+
+
+@pytest.mark.parametrize(
+    ("eviction", "expected"),
+    [
+        (EvictionPolicy.LFU, ["camera.a", "camera.b"]),
+        (EvictionPolicy.LRU, ["camera.c", "camera.b"]),
+    ],
+)
+def test_candidates(
+    rest_client: Go2RtcRestClient,
+    now: list[float],
+    eviction: EvictionPolicy,
+    expected: list[str],
+) -> None:
+    """Test the candidates are ranked by the eviction policy."""
+    scheduler = PreloadScheduler(rest_client, max_preloads=2, eviction=eviction)
+    _access(scheduler, "camera.a", "camera.a", "camera.a")
+    now[0] += 1
+    _access(scheduler, "camera.b", "camera.b")
+    now[0] += 1
+    _access(scheduler, "camera.c")
+
+    assert scheduler.candidates() == expected
+
+
+def test_candidates_window(rest_client: Go2RtcRestClient, now: list[float]) -> None:
+    """Test accesses outside of the window are forgotten."""
+    scheduler = PreloadScheduler(rest_client, window=60)
+    _access(scheduler, "camera.a", "camera.a", "camera.b")
+    now[0] += 30
+    _access(scheduler, "camera.b")
+    now[0] += 31
+
+    assert scheduler.candidates() == ["camera.b"]
+    now[0] += 30
+    assert scheduler.candidates() == []
+
+
+def test_invalid_max_preloads(rest_client: Go2RtcRestClient) -> None:
+    """Test max preloads must be positive."""
+    with pytest.raises(ValueError, match="Max preloads must be at least 1"):
+        PreloadScheduler(rest_client, max_preloads=0)
+
+
+async def test_schedule(
+    responses: aiointercept, rest_client: Go2RtcRestClient, now: list[float]
+) -> None:
+    """Test preloads are enabled for candidates and disabled for evicted streams."""
+    responses.get(PRELOAD_URL, status=200, body="{}", repeat=True)
+    responses.put(f"{PRELOAD_URL}?src=camera.a", status=200)
+    responses.put(f"{PRELOAD_URL}?src=camera.b", status=200)
+    responses.put(f"{PRELOAD_URL}?src=camera.c", status=200)
+    responses.delete(f"{PRELOAD_URL}?src=camera.a", status=200)
+    scheduler = PreloadScheduler(rest_client, max_preloads=2, window=60)
+    _access(scheduler, "camera.a", "camera.b")
+
+    result = await scheduler.schedule()
+    assert sorted(r.key for r in result.enabled) == ["camera.a", "camera.b"]
+    assert result.disabled == []
+    assert result.ok
+    assert scheduler.preloaded == {"camera.a", "camera.b"}
+
+    # Nothing changed
+    result = await scheduler.schedule()
+    assert result.enabled == result.disabled == []
+
+    now[0] += 30
+    _access(scheduler, "camera.b", "camera.c")
+    now[0] += 31
+    result = await scheduler.schedule()
+    assert [r.key for r in result.disabled] == ["camera.a"]
+    assert [r.key for r in result.enabled] == ["camera.c"]
+    assert scheduler.preloaded == {"camera.b", "camera.c"}
+    assert responses.call_count == 6
+
+
+async def test_schedule_failed(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test failed changes are retried on the next run."""
+    responses.get(PRELOAD_URL, status=200, body="{}", repeat=True)
+    responses.put(f"{PRELOAD_URL}?src=camera.a", status=500)
+    scheduler = PreloadScheduler(rest_client)
+    _access(scheduler, "camera.a")
+
+    result = await scheduler.schedule()
+    assert not result.ok
+    assert scheduler.preloaded == frozenset()
+
+    responses.put(f"{PRELOAD_URL}?src=camera.a", status=200)
+    result = await scheduler.schedule()
+    assert result.ok
+    assert scheduler.preloaded == {"camera.a"}
+
+
+async def test_schedule_skips_foreign_preloads(
+    responses: aiointercept, rest_client: Go2RtcRestClient, now: list[float]
+) -> None:
+    """Test preloads enabled by others are neither changed nor taken over."""
+    responses.get(
+        PRELOAD_URL,
+        status=200,
+        body=json.dumps({"camera.a": {"query": "video=h264&audio"}}),
+        repeat=True,
+    )
+    responses.put(f"{PRELOAD_URL}?src=camera.b", status=200)
+    scheduler = PreloadScheduler(rest_client, max_preloads=2, window=60)
+    _access(scheduler, "camera.a", "camera.b")
+
+    result = await scheduler.schedule()
+    assert [r.key for r in result.enabled] == ["camera.b"]
+    assert scheduler.preloaded == {"camera.b"}
+
+    # Only the own preload is disabled on eviction
+    responses.delete(f"{PRELOAD_URL}?src=camera.b", status=200)
+    now[0] += 61
+    result = await scheduler.schedule()
+    assert [r.key for r in result.disabled] == ["camera.b"]
+    assert scheduler.preloaded == frozenset()
+    assert responses.call_count == 3
+
+
+async def test_start_stop(
+    responses: aiointercept,
+    rest_client: Go2RtcRestClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test accesses of the client are scheduled periodically."""
+    responses.get(
+        f"{URL}{_API_PREFIX}/frame.jpeg?src=camera.a",
+        status=200,
+        body=load_fixture_bytes("snapshot.jpg"),
+    )
+    responses.post(
+        f"{URL}{_WebRTCClient.PATH}?src=camera.b",
+        status=200,
+        body=load_fixture_str("webrtc_answer.json"),
+    )
+    responses.get(PRELOAD_URL, status=200, body="{}", repeat=True)
+    responses.put(f"{PRELOAD_URL}?src=camera.a", status=200)
+    responses.put(f"{PRELOAD_URL}?src=camera.b", status=500, repeat=True)
+    scheduler = PreloadScheduler(rest_client, interval=0.01)
+    scheduler.start()
+    scheduler.start()
+
+    await rest_client.get_jpeg_snapshot("camera.a")
+    await rest_client.webrtc.forward_whep_sdp_offer("camera.b", WebRTCSdpOffer("v=0"))
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert scheduler.preloaded == {"camera.a"}
+    assert any(
+        record.levelno == logging.WARNING
+        and record.message.startswith("Error changing preload of camera.b")
+        for record in caplog.records
+    )
+
+    # Accesses are no longer recorded
+    responses.get(
+        f"{URL}{_API_PREFIX}/frame.jpeg?src=camera.c",
+        status=200,
+        body=load_fixture_bytes("snapshot.jpg"),
+    )
+    await rest_client.get_jpeg_snapshot("camera.c")
+    assert sorted(scheduler.candidates()) == ["camera.a", "camera.b"]
+    await scheduler.stop()
+
+
+async def test_schedule_error_logged(
+    responses: aiointercept,
+    rest_client: Go2RtcRestClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an error while listing the preloads is logged and retried."""
+    responses.get(PRELOAD_URL, status=500, repeat=True)
+    scheduler = PreloadScheduler(rest_client, interval=0.01)
+    scheduler.record_access("camera.a")
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert responses.call_count > 1
+    assert (
+        "go2rtc_client.scheduler",
+        logging.ERROR,
+        "Error scheduling preloads",
+    ) in caplog.record_tuples
+
+
+async def test_streamed_snapshot_recorded(
+    responses: aiointercept, rest_client: Go2RtcRestClient
+) -> None:
+    """Test streamed snapshots count as accesses."""
+    responses.get(
+        f"{URL}{_API_PREFIX}/frame.jpeg?src=camera.a",
+        status=200,
+        body=load_fixture_bytes("snapshot.jpg"),
+    )
+    scheduler = PreloadScheduler(rest_client)
+    rest_client.subscribe_access(scheduler.record_access)
+
+    await rest_client.write_jpeg_snapshot("camera.a", BytesIO())
+
+    assert scheduler.candidates() == ["camera.a"]
+
+
+async def test_access_callback_raised(
+    responses: aiointercept,
+    rest_client: Go2RtcRestClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an exception raised by an access callback is logged."""
+    responses.get(
+        f"{URL}{_API_PREFIX}/frame.jpeg?src=camera.a",
+        status=200,
+        body=load_fixture_bytes("snapshot.jpg"),
+    )
+
+    def on_access(_: str) -> None:
+        raise ValueError
+
+    rest_client.subscribe_access(on_access)
+    await rest_client.get_jpeg_snapshot("camera.a")
+
+    assert caplog.record_tuples == [
+        ("go2rtc_client.rest", logging.ERROR, "Error on stream access callback")
+    ]
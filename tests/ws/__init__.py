@@ -0,0 +1,56 @@
+"""Tests for the websocket module."""
+
+from typing import TYPE_CHECKING, Self
+
+from aiohttp import WSMessage, web
+from aiohttp.test_utils import TestServer as AioHttpTestServer
+from aiohttp.web import WebSocketResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+
+class TestServer:
+    """Test server."""
+
+    __test__ = False
+
+    def __init__(self) -> None:
+        """Initialize the test server."""
+        self.server: AioHttpTestServer
+        self.send_message: Callable[[str], Coroutine[None, None, None]]
+        self.send_bytes: Callable[[bytes], Coroutine[None, None, None]]
+        self.close_connection: Callable[[], Coroutine[None, None, bool]]
+        self.on_message: Callable[[WSMessage], None] = lambda _: None
+        self.connections = 0
+        self.autoping = True
+
+    async def __aenter__(self) -> Self:
+        """Start the test server."""
+
+        async def websocket_handler(request: web.Request) -> WebSocketResponse:
+            ws = web.WebSocketResponse(autoping=self.autoping)
+            await ws.prepare(request)
+            self.connections += 1
+
+            async def send_message(message: str) -> None:
+                await ws.send_str(message)
+
+            self.send_message = send_message
+            self.send_bytes = ws.send_bytes
+            self.close_connection = ws.close
+
+            async for msg in ws:
+                self.on_message(msg)
+
+            return ws
+
+        app = web.Application()
+        app.router.add_get("/api/ws", websocket_handler)
+        self.server = AioHttpTestServer(app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close the test server."""
+        await self.server.close()
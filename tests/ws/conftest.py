@@ -0,0 +1,14 @@
+"""Fixtures for the websocket tests."""
+
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from . import TestServer
+
+
+@pytest.fixture
+async def server() -> AsyncGenerator[TestServer, None]:
+    """Fixture to create a WebSocket test server."""
+    async with TestServer() as server:
+        yield server
@@ -1,9 +1,8 @@
 """Tests for the Go2RtcWsClient class."""
 
 import asyncio
-from collections.abc import AsyncGenerator, Callable, Coroutine
+from collections.abc import AsyncGenerator
 import logging
-from typing import Self
 from unittest.mock import AsyncMock
 
 from aiohttp import (
@@ -12,70 +11,30 @@ from aiohttp import (
     WSMessage,
     WSMsgType,
     WSServerHandshakeError,
-    web,
 )
-from aiohttp.test_utils import TestClient, TestServer as AioHttpTestServer
-from aiohttp.web import WebSocketResponse
+from aiohttp.test_utils import TestClient
 from multidict import CIMultiDict, CIMultiDictProxy
 import pytest
 from webrtc_models import RTCIceServer
 from yarl import URL
 
 from go2rtc_client.exceptions import Go2RtcClientError
+from go2rtc_client.policies import BackoffPolicy
 from go2rtc_client.ws import (
+    ConnectionState,
+    DeliveryStats,
     Go2RtcWsClient,
+    MessageQueue,
+    OverflowPolicy,
     ReceiveMessages,
     SendMessages,
     WebRTCAnswer,
     WebRTCCandidate,
     WebRTCOffer,
+    WsError,
 )
 
-
-class TestServer:
-    """Test server."""
-
-    __test__ = False
-
-    def __init__(self) -> None:
-        """Initialize the test server."""
-        self.server: AioHttpTestServer
-        self.send_message: Callable[[str], Coroutine[None, None, None]]
-        self.on_message: Callable[[WSMessage], None] = lambda _: None
-
-    async def __aenter__(self) -> Self:
-        """Start the test server."""
-
-        async def websocket_handler(request: web.Request) -> WebSocketResponse:
-            ws = web.WebSocketResponse()
-            await ws.prepare(request)
-
-            async def send_message(message: str) -> None:
-                await ws.send_str(message)
-
-            self.send_message = send_message
-
-            async for msg in ws:
-                self.on_message(msg)
-
-            return ws
-
-        app = web.Application()
-        app.router.add_get("/api/ws", websocket_handler)
-        self.server = AioHttpTestServer(app)
-        await self.server.start_server()
-        return self
-
-    async def __aexit__(self, *args: object) -> None:
-        """Close the test server."""
-        await self.server.close()
-
-
-@pytest.fixture
-async def server() -> AsyncGenerator[TestServer, None]:
-    """Fixture to create a WebSocket test server."""
-    async with TestServer() as server:
-        yield server
+from . import TestServer
 
 
 # Fixture to create the Go2RtcWsClient with type hints
@@ -187,6 +146,19 @@ async def test_receive(
     assert received_message == expected
 
 
+async def test_receive_binary(
+    ws_client_connected: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test receiving a message in a binary frame."""
+    received: list[ReceiveMessages] = []
+    ws_client_connected.subscribe(received.append)
+
+    await server.send_bytes(b'{"value":"test","type":"webrtc/candidate"}')
+    await asyncio.sleep(0.1)
+
+    assert received == [WebRTCCandidate("test")]
+
+
 async def test_close(ws_client_connected: Go2RtcWsClient) -> None:
     """Test closing the WebSocket connection."""
     assert ws_client_connected.connected
@@ -275,6 +247,166 @@ async def test_subscribe_unsubscribe(ws_client: Go2RtcWsClient) -> None:
     assert ws_client._subscribers == []
 
 
+async def test_subscribe_message_type(
+    ws_client_connected: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test typed subscribers only receive messages of their type."""
+    # pylint: disable=protected-access
+    candidates: list[WebRTCCandidate] = []
+    answers: list[WebRTCAnswer] = []
+    received: list[ReceiveMessages] = []
+
+    unsub = ws_client_connected.subscribe(candidates.append, WebRTCCandidate)
+    ws_client_connected.subscribe(answers.append, WebRTCAnswer)
+    ws_client_connected.subscribe(received.append)
+
+    await server.send_message(WebRTCCandidate("candidate").to_json())
+    await server.send_message(
+        '{"value":{"type":"answer","sdp":"answer"},"type":"webrtc"}'
+    )
+    await server.send_message(WsError("error").to_json())
+    await asyncio.sleep(0.1)
+
+    assert candidates == [WebRTCCandidate("candidate")]
+    assert answers == [WebRTCAnswer("answer")]
+    assert received == [
+        WebRTCCandidate("candidate"),
+        WebRTCAnswer("answer"),
+        WsError("error"),
+    ]
+
+    unsub()
+    assert WebRTCCandidate not in ws_client_connected._handlers
+
+
+async def test_messages(
+    ws_client_connected: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test iterating over the received messages of a type."""
+    # pylint: disable=protected-access
+    messages = ws_client_connected.messages(WebRTCCandidate)
+    task = asyncio.create_task(anext(messages))
+    await asyncio.sleep(0)
+
+    await server.send_message(WsError("error").to_json())
+    await server.send_message(WebRTCCandidate("candidate").to_json())
+
+    assert await task == WebRTCCandidate("candidate")
+    await messages.aclose()
+    assert ws_client_connected._handlers == {}
+    assert ws_client_connected._queues == set()
+
+
+async def test_messages_end_on_close(
+    ws_client_connected: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test the iteration ends when the connection is closed."""
+    received: list[ReceiveMessages] = []
+
+    async def consume() -> None:
+        received.extend([message async for message in ws_client_connected.messages()])
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    await server.send_message(WebRTCCandidate("candidate").to_json())
+    await asyncio.sleep(0.1)
+    await ws_client_connected.close()
+    await task
+
+    assert received == [WebRTCCandidate("candidate")]
+    # pylint: disable-next=protected-access
+    assert ws_client_connected._subscribers == []
+
+
+@pytest.mark.parametrize(
+    ("overflow", "expected"),
+    [
+        (OverflowPolicy.DROP_NEWEST, ["2", "3"]),
+        (OverflowPolicy.DROP_OLDEST, ["3", "4"]),
+        (OverflowPolicy.BLOCK, ["2", "3", "4"]),
+    ],
+)
+async def test_messages_queue_full(
+    ws_client_connected: Go2RtcWsClient,
+    server: TestServer,
+    overflow: OverflowPolicy,
+    expected: list[str],
+) -> None:
+    """Test the overflow policy applies while the queue is full."""
+    messages = ws_client_connected.messages(
+        WebRTCCandidate, maxsize=2, overflow=overflow
+    )
+    task = asyncio.create_task(anext(messages))
+    await asyncio.sleep(0)
+    await server.send_message(WebRTCCandidate("1").to_json())
+    assert await task == WebRTCCandidate("1")
+
+    for candidate in ("2", "3", "4"):
+        await server.send_message(WebRTCCandidate(candidate).to_json())
+    await asyncio.sleep(0.1)
+
+    received = [await anext(messages) for _ in expected]
+    assert received == [WebRTCCandidate(candidate) for candidate in expected]
+    await messages.aclose()
+
+
+async def test_subscribe_queued(
+    ws_client_connected: Go2RtcWsClient,
+    server: TestServer,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test queued subscribers are called from a separate task."""
+    # pylint: disable=protected-access
+    queue: MessageQueue[WebRTCCandidate] = MessageQueue()
+    received: list[WebRTCCandidate] = []
+
+    def on_candidate(candidate: WebRTCCandidate) -> None:
+        received.append(candidate)
+        if candidate.candidate == "raise":
+            raise ValueError
+
+    unsub = ws_client_connected.subscribe(on_candidate, WebRTCCandidate, queue=queue)
+    await server.send_message(WebRTCCandidate("raise").to_json())
+    await server.send_message(WebRTCCandidate("candidate").to_json())
+    await asyncio.sleep(0.1)
+
+    assert received == [WebRTCCandidate("raise"), WebRTCCandidate("candidate")]
+    assert queue.stats == DeliveryStats(queued=2, dropped=0)
+    assert caplog.record_tuples == [
+        ("go2rtc_client.ws.client", logging.ERROR, "Error on subscriber callback")
+    ]
+
+    unsub()
+    await asyncio.sleep(0.1)
+    assert queue.closed
+    assert ws_client_connected._queues == set()
+    assert ws_client_connected._delivery_tasks == set()
+
+
+async def test_subscribe_queued_after_reconnect(
+    ws_client_connected: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test queued subscribers keep receiving after close and connect."""
+    queued: list[ReceiveMessages] = []
+    plain: list[ReceiveMessages] = []
+    queue: MessageQueue[ReceiveMessages] = MessageQueue()
+    ws_client_connected.subscribe(queued.append, queue=queue)
+    ws_client_connected.subscribe(plain.append)
+
+    await server.send_message(WebRTCCandidate("a").to_json())
+    await asyncio.sleep(0.1)
+    await ws_client_connected.close()
+    assert not queue.closed
+
+    await ws_client_connected.connect()
+    await server.send_message(WebRTCCandidate("b").to_json())
+    await asyncio.sleep(0.1)
+
+    expected = [WebRTCCandidate("a"), WebRTCCandidate("b")]
+    assert plain == expected
+    assert queued == expected
+
+
 async def test_subscriber_raised(
     ws_client_connected: Go2RtcWsClient,
     server: TestServer,
@@ -313,13 +445,13 @@ async def test_subscriber_raised(
     ("message", "record"),
     [
         (
-            WSMessage(WSMsgType.BINARY, b"bytes", None),
+            WSMessage(WSMsgType.CONTINUATION, b"bytes", None),
             (
                 "go2rtc_client.ws.client",
                 logging.WARNING,
                 (
-                    "Received unknown message: WSMessage(type=<WSMsgType.BINARY: 2>,"
-                    " data=b'bytes', extra=None)"
+                    "Received unknown message: WSMessage(type=<WSMsgType.CONTINUATION:"
+                    " 0>, data=b'bytes', extra=None)"
                 ),
             ),
         ),
@@ -330,7 +462,7 @@ async def test_subscriber_raised(
         (
             WSMessage(
                 WSMsgType.TEXT,
-                '{"value":{"sdp":"test","ice_servers":[],"type":"offer"},"type":"webrtc"}',
+                b'{"value":{"sdp":"test","ice_servers":[],"type":"offer"},"type":"webrtc"}',
                 None,
             ),
             (
@@ -364,3 +496,311 @@ async def test_unexpected_messages(
     await asyncio.sleep(0.1)
 
     assert caplog.record_tuples == [record]
+
+
+async def test_reconnect(server: TestServer) -> None:
+    """Test a lost connection is reconnected and subscribers are kept."""
+    transitions: list[tuple[ConnectionState, ConnectionState]] = []
+    received: list[WebRTCCandidate] = []
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            reconnect=BackoffPolicy(initial=0, jitter=False),
+            on_state_change=lambda old, new: transitions.append((old, new)),
+        )
+        client.subscribe(received.append, WebRTCCandidate)
+        await client.connect()
+        assert client.state is ConnectionState.CONNECTED
+
+        await server.close_connection()
+        await asyncio.sleep(0.1)
+
+        assert client.connected
+        assert server.connections == 2
+        await server.send_message(WebRTCCandidate("candidate").to_json())
+        await asyncio.sleep(0.1)
+        assert received == [WebRTCCandidate("candidate")]
+
+        await client.close()
+
+    assert client.state is ConnectionState.DISCONNECTED
+    assert transitions == [
+        (ConnectionState.DISCONNECTED, ConnectionState.CONNECTED),
+        (ConnectionState.CONNECTED, ConnectionState.RECONNECTING),
+        (ConnectionState.RECONNECTING, ConnectionState.CONNECTED),
+        (ConnectionState.CONNECTED, ConnectionState.DISCONNECTED),
+    ]
+
+
+async def test_reconnect_retries(
+    server: TestServer, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test failed reconnect attempts are retried until close is called."""
+
+    def on_state_change(_: ConnectionState, __: ConnectionState) -> None:
+        raise ValueError
+
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            reconnect=BackoffPolicy(initial=0.01, jitter=False),
+            on_state_change=on_state_change,
+        )
+        await client.connect()
+        client._session.ws_connect = AsyncMock(side_effect=ClientError)  # type: ignore[method-assign] # pylint: disable=protected-access
+
+        await server.close_connection()
+        await asyncio.sleep(0.1)
+
+        assert client.state is ConnectionState.RECONNECTING
+        assert client._session.ws_connect.call_count > 1  # pylint: disable=protected-access
+        await client.close()
+
+    assert client.state is ConnectionState.DISCONNECTED
+    assert (
+        "go2rtc_client.ws.client",
+        logging.WARNING,
+        f"Connection to {server.server.make_url('/')} lost",
+    ) in caplog.record_tuples
+    assert (
+        "go2rtc_client.ws.client",
+        logging.ERROR,
+        "Error on connection state callback",
+    ) in caplog.record_tuples
+
+
+async def test_no_reconnect_by_default(
+    ws_client_connected: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test a lost connection is not reconnected without a backoff policy."""
+    await server.close_connection()
+    await asyncio.sleep(0.1)
+
+    assert not ws_client_connected.connected
+    assert ws_client_connected.state is ConnectionState.DISCONNECTED
+    assert server.connections == 1
+
+
+async def test_heartbeat_latency(server: TestServer) -> None:
+    """Test the heartbeat measures the latency."""
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            heartbeat=0.05,
+        )
+        await client.connect()
+        assert client.latency is None
+
+        await asyncio.sleep(0.2)
+
+        assert client.connected
+        assert client.latency is not None
+        assert client.latency < 0.05
+        await client.close()
+
+
+async def test_heartbeat_blocked_queue(server: TestServer) -> None:
+    """Test a receive loop blocked by a full queue is not considered dead."""
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            heartbeat=0.05,
+        )
+        await client.connect()
+        messages = client.messages(maxsize=1, overflow=OverflowPolicy.BLOCK)
+        task = asyncio.create_task(anext(messages))
+        await asyncio.sleep(0)
+        for candidate in ("1", "2"):
+            await server.send_message(WebRTCCandidate(candidate).to_json())
+        assert await task == WebRTCCandidate("1")
+
+        # The loop blocks on the full queue for several heartbeats
+        await asyncio.sleep(0.3)
+        assert client.connected
+
+        assert await anext(messages) == WebRTCCandidate("2")
+        await asyncio.sleep(0.2)
+        assert client.connected
+        assert client.latency is not None
+        await messages.aclose()
+        await client.close()
+
+
+async def test_heartbeat_dead_peer(
+    server: TestServer, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a connection without pongs is closed."""
+    server.autoping = False
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            heartbeat=0.05,
+        )
+        await client.connect()
+        await asyncio.sleep(0.3)
+
+        assert not client.connected
+        assert client.state is ConnectionState.DISCONNECTED
+        assert client.latency is None
+        assert (
+            "go2rtc_client.ws.client",
+            logging.WARNING,
+            (
+                f"No pong received from {server.server.make_url('/')} within 0.05"
+                " seconds, closing connection"
+            ),
+        ) in caplog.record_tuples
+
+
+async def test_ping_answered(ws_client: Go2RtcWsClient) -> None:
+    """Test a ping is answered and pongs do not end the receive loop."""
+    client = AsyncMock()
+    client.return_value.closed = False
+    ws_client._session.ws_connect = client  # type: ignore[method-assign] # pylint: disable=protected-access
+    messages = [
+        WSMessage(WSMsgType.PING, b"ping", None),
+        WSMessage(WSMsgType.PONG, b"", None),
+        WSMessage(WSMsgType.CLOSED, None, None),
+    ]
+    client.return_value.receive.side_effect = messages
+
+    await ws_client.connect()
+    await asyncio.sleep(0.1)
+
+    client.return_value.pong.assert_awaited_once_with(b"ping")
+    assert client.return_value.receive.await_count == 3
+
+
+@pytest.fixture
+async def batching_client(
+    server: TestServer,
+) -> AsyncGenerator[Go2RtcWsClient, None]:
+    """Fixture to create a client which buffers ICE candidates."""
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            candidate_window=0.05,
+        )
+        await client.connect()
+        yield client
+        await client.close()
+
+
+async def test_candidates_buffered(
+    batching_client: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test candidates are sent together after the window."""
+    received: list[str] = []
+    server.on_message = lambda msg: received.append(msg.data)
+
+    for candidate in ("1", "2", "3"):
+        await batching_client.send(WebRTCCandidate(candidate))
+    await asyncio.sleep(0.01)
+    assert not received
+
+    await asyncio.sleep(0.1)
+    assert received == [
+        WebRTCCandidate(candidate).to_json() for candidate in ("1", "2", "3")
+    ]
+
+
+async def test_candidates_flushed(
+    batching_client: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test the end of candidates and other messages flush the buffer."""
+    received: list[str] = []
+    server.on_message = lambda msg: received.append(msg.data)
+
+    await batching_client.send(WebRTCCandidate("1"))
+    await batching_client.send(WebRTCOffer("v=0", []))
+    await batching_client.send(WebRTCCandidate("2"))
+    await batching_client.send(WebRTCCandidate(""))
+    await asyncio.sleep(0.01)
+
+    assert received == [
+        WebRTCCandidate("1").to_json(),
+        WebRTCOffer("v=0", []).to_json(),
+        WebRTCCandidate("2").to_json(),
+        WebRTCCandidate("").to_json(),
+    ]
+
+
+async def test_candidates_flushed_on_close(
+    batching_client: Go2RtcWsClient, server: TestServer
+) -> None:
+    """Test buffered candidates are sent before closing."""
+    received: list[str] = []
+    server.on_message = lambda msg: received.append(msg.data)
+
+    await batching_client.send(WebRTCCandidate("1"))
+    await batching_client.close()
+    await asyncio.sleep(0.01)
+
+    assert received == [WebRTCCandidate("1").to_json()]
+
+
+async def test_candidates_dropped_on_close_before_connect(
+    server: TestServer,
+) -> None:
+    """Test closing an unconnected client drops the buffered candidates."""
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            candidate_window=0.05,
+        )
+        await client.send(WebRTCCandidate("1"))
+        await client.close()
+        await asyncio.sleep(0.1)
+
+        assert not client.connected
+        assert client.state is ConnectionState.DISCONNECTED
+        assert server.connections == 0
+
+
+async def test_candidates_flush_connects(server: TestServer) -> None:
+    """Test flushing the buffered candidates connects the client."""
+    received: list[str] = []
+    server.on_message = lambda msg: received.append(msg.data)
+    async with TestClient(server.server).session as session:
+        client = Go2RtcWsClient(
+            session,
+            str(server.server.make_url("/")),
+            source="source",
+            candidate_window=0.05,
+        )
+        await client.send(WebRTCCandidate("1"))
+        await client.flush()
+        await asyncio.sleep(0.01)
+
+        assert client.connected
+        assert received == [WebRTCCandidate("1").to_json()]
+        await client.close()
+
+
+async def test_candidates_flush_error(
+    batching_client: Go2RtcWsClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test an error while sending the buffered candidates is logged."""
+    # pylint: disable-next=protected-access
+    batching_client._client.send_str = AsyncMock(side_effect=ClientError)  # type: ignore[method-assign,union-attr]
+
+    await batching_client.send(WebRTCCandidate("1"))
+    await asyncio.sleep(0.1)
+
+    assert caplog.record_tuples == [
+        ("go2rtc_client.ws.client", logging.ERROR, "Error sending ICE candidates")
+    ]
@@ -0,0 +1,67 @@
+"""Tests for the queued delivery."""
+
+import asyncio
+
+import pytest
+
+from go2rtc_client.ws import DeliveryStats, MessageQueue, OverflowPolicy
+
+
+@pytest.mark.parametrize(
+    ("overflow", "expected", "stats"),
+    [
+        (OverflowPolicy.DROP_OLDEST, [2, 3], DeliveryStats(queued=3, dropped=1)),
+        (OverflowPolicy.DROP_NEWEST, [1, 2], DeliveryStats(queued=2, dropped=1)),
+        (OverflowPolicy.BLOCK, [1, 2, 3], DeliveryStats(queued=3, dropped=0)),
+    ],
+)
+async def test_overflow(
+    overflow: OverflowPolicy, expected: list[int], stats: DeliveryStats
+) -> None:
+    """Test the overflow policies."""
+    queue: MessageQueue[int] = MessageQueue(maxsize=2, overflow=overflow)
+    for message in (1, 2, 3):
+        queue.put_nowait(message)
+    queue.close()
+
+    assert [message async for message in queue] == expected
+    assert queue.stats == stats
+
+
+async def test_wait_for_room() -> None:
+    """Test a blocking queue waits until the consumer made room."""
+    queue: MessageQueue[int] = MessageQueue(maxsize=1, overflow=OverflowPolicy.BLOCK)
+    queue.put_nowait(1)
+
+    task = asyncio.create_task(queue.wait_for_room())
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    assert await queue.get() == 1
+    await task
+    assert len(queue) == 0
+
+
+async def test_get_waits_for_message() -> None:
+    """Test get waits until a message is queued or the queue is closed."""
+    queue: MessageQueue[int] = MessageQueue()
+    task = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    queue.put_nowait(1)
+    assert await task == 1
+
+    task = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    queue.close()
+    with pytest.raises(StopAsyncIteration):
+        await task
+
+    # Messages are ignored after closing
+    queue.put_nowait(2)
+    assert len(queue) == 0
+
+
+async def test_invalid_maxsize() -> None:
+    """Test the max size must be at least 1."""
+    with pytest.raises(ValueError, match="Max size must be at least 1"):
+        MessageQueue(maxsize=0)
@@ -0,0 +1,96 @@
+"""Tests for the websocket messages."""
+
+import orjson
+import pytest
+from webrtc_models import RTCIceServer
+
+from go2rtc_client.ws import WebRTCAnswer, WebRTCCandidate, WebRTCOffer, WsError
+from go2rtc_client.ws.messages import (
+    BaseMessage,
+    WebRTC,
+    WsMessage,
+    _ice_servers_fragment,
+    decode_message,
+)
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (
+            '{"value":"candidate","type":"webrtc/candidate"}',
+            WebRTCCandidate("candidate"),
+        ),
+        (
+            b'{"value":"candidate","type":"webrtc/candidate"}',
+            WebRTCCandidate("candidate"),
+        ),
+        (
+            '{"value":{"type":"answer","sdp":"sdp"},"type":"webrtc"}',
+            WebRTCAnswer("sdp"),
+        ),
+        ('{"value":"error","type":"error"}', WsError("error")),
+        (
+            '{"value":{"type":"offer","sdp":"sdp","ice_servers":[]},"type":"webrtc"}',
+            WebRTC(WebRTCOffer("sdp", [])),
+        ),
+    ],
+)
+def test_decode_message(data: str | bytes, expected: WsMessage) -> None:
+    """Test decoding the received messages."""
+    assert decode_message(data) == expected
+
+
+def test_decode_message_fallback() -> None:
+    """Test messages outside of the fast path decode like BaseMessage."""
+    data = '{"value":1,"type":"webrtc/candidate"}'
+    assert decode_message(data) == BaseMessage.from_json(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        '{"type":"error"}',
+        '{"value":{"type":"answer"},"type":"webrtc"}',
+        '{"type":"unknown"}',
+        "[]",
+    ],
+)
+def test_decode_invalid_message(data: str) -> None:
+    """Test invalid messages raise like BaseMessage."""
+    with pytest.raises(Exception) as expected:  # noqa: PT011
+        BaseMessage.from_json(data)
+    with pytest.raises(expected.type):
+        decode_message(data)
+
+
+def test_offer_ice_servers_cached() -> None:
+    """Test the ice servers are serialized once per distinct list."""
+    _ice_servers_fragment.cache_clear()
+    server = RTCIceServer("stun:url", "user", "pass")
+    expected = (
+        '{"value":{"sdp":"sdp","ice_servers":[{"urls":["stun:url"],"username":"user",'
+        '"credential":"pass"}],"type":"offer"},"type":"webrtc"}'
+    )
+
+    assert WebRTCOffer("sdp", [server]).to_json() == expected
+    assert WebRTCOffer(
+        "sdp", [RTCIceServer(["stun:url"], "user", "pass")]
+    ).to_json() == (expected)
+    assert _ice_servers_fragment.cache_info().hits == 1
+    # The ice servers are not modified
+    assert server.urls == "stun:url"
+
+
+def test_offer_to_json_with_options() -> None:
+    """Test serializing with options uses the dataclass serializer."""
+    server = RTCIceServer("url")
+    offer = WebRTCOffer("sdp", [server])
+
+    assert (
+        offer.to_json(orjson_options=orjson.OPT_INDENT_2)
+        == orjson.dumps(
+            orjson.loads(offer.to_json()), option=orjson.OPT_INDENT_2
+        ).decode()
+    )
+    assert server.urls == "url"
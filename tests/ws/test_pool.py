@@ -0,0 +1,197 @@
+"""Tests for the Go2RtcWsPool class."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+import contextlib
+
+from aiohttp import WSMessage
+from aiohttp.test_utils import TestClient
+import pytest
+
+from go2rtc_client.exceptions import Go2RtcClientError
+from go2rtc_client.ws import (
+    Go2RtcWsPool,
+    ReceiveMessages,
+    SessionState,
+    WebRTCAnswer,
+    WebRTCCandidate,
+    WebRTCOffer,
+    WsError,
+)
+
+from . import TestServer
+
+
+@pytest.fixture
+async def pool(server: TestServer) -> AsyncGenerator[Go2RtcWsPool, None]:
+    """Fixture to create and return a pool."""
+    async with TestClient(server.server).session as session:
+        pool = Go2RtcWsPool(
+            session, str(server.server.make_url("/")), max_connections=2
+        )
+        yield pool
+        await pool.close()
+
+
+async def test_session_routing_and_state(
+    pool: Go2RtcWsPool, server: TestServer
+) -> None:
+    """Test messages are routed to the session and its state is tracked."""
+    sent: list[str] = []
+
+    def on_server_message(msg: WSMessage) -> None:
+        sent.append(msg.data)
+
+    server.on_message = on_server_message
+    received: list[ReceiveMessages] = []
+
+    async with await pool.acquire(source="camera") as session:
+        session.subscribe(received.append)
+        assert session.state is SessionState.NEW
+
+        await session.send(WebRTCOffer("v=0", []))
+        assert session.state is SessionState.OFFER_SENT
+
+        await server.send_message(WebRTCCandidate("candidate").to_json())
+        await server.send_message(
+            '{"value":{"type":"answer","sdp":"answer"},"type":"webrtc"}'
+        )
+        await asyncio.sleep(0.1)
+        assert session.state is SessionState.ANSWERED
+
+    assert session.state is SessionState.RELEASED
+    assert received == [WebRTCCandidate("candidate"), WebRTCAnswer("answer")]
+    assert len(sent) == 1
+    with pytest.raises(RuntimeError, match="Session already released"):
+        await session.send(WebRTCCandidate("candidate"))
+    # Releasing twice is a no-op
+    await session.release()
+    assert pool.active == 0
+
+
+async def test_session_error_state(pool: Go2RtcWsPool, server: TestServer) -> None:
+    """Test an error message fails the session."""
+    session = await pool.acquire(destination="camera")
+    await server.send_message(WsError("error").to_json())
+    await asyncio.sleep(0.1)
+
+    assert session.state is SessionState.FAILED
+    await session.release()
+
+
+async def test_connection_per_session(pool: Go2RtcWsPool, server: TestServer) -> None:
+    """Test late messages of a released session do not reach the next session."""
+    first = await pool.acquire(source="camera")
+    await first.send(WebRTCOffer("v=0", []))
+    send_late = server.send_message
+    await first.release()
+
+    second = await pool.acquire(source="camera")
+    received: list[ReceiveMessages] = []
+    unsubscribe = second.subscribe(received.append)
+    with contextlib.suppress(ConnectionError):
+        await send_late(WsError("late").to_json())
+    await asyncio.sleep(0.1)
+
+    assert server.connections == 2
+    assert not received
+    assert second.state is SessionState.NEW
+    unsubscribe()
+    await second.release()
+
+
+async def test_max_connections(pool: Go2RtcWsPool, server: TestServer) -> None:
+    """Test acquiring waits while all connections are in use."""
+    first = await pool.acquire(source="one")
+    second = await pool.acquire(source="two")
+
+    task = asyncio.create_task(pool.acquire(source="three"))
+    await asyncio.sleep(0.1)
+    assert not task.done()
+
+    await first.release()
+    third = await task
+    assert pool.active == 2
+    assert server.connections == 3
+
+    await second.release()
+    await third.release()
+
+
+async def test_acquire_timeout(server: TestServer) -> None:
+    """Test acquiring raises if no connection becomes available in time."""
+    async with TestClient(server.server).session as session:
+        pool = Go2RtcWsPool(
+            session,
+            str(server.server.make_url("/")),
+            max_connections=1,
+            acquire_timeout=0.05,
+        )
+        first = await pool.acquire(source="camera")
+        with pytest.raises(TimeoutError):
+            await pool.acquire(source="camera")
+
+        assert pool.active == 1
+        await first.release()
+
+
+async def test_close_wakes_waiting_acquire(
+    pool: Go2RtcWsPool, server: TestServer
+) -> None:
+    """Test closing the pool fails acquires waiting for a connection."""
+    first = await pool.acquire(source="one")
+    second = await pool.acquire(source="two")
+    task = asyncio.create_task(pool.acquire(source="three"))
+    await asyncio.sleep(0.1)
+
+    await pool.close()
+    with pytest.raises(RuntimeError, match="Pool is closed"):
+        await task
+
+    await first.release()
+    await second.release()
+    assert pool.active == 0
+    assert server.connections == 2
+
+
+async def test_connect_failed(server: TestServer) -> None:
+    """Test the slot is freed if connecting fails."""
+    async with TestClient(server.server).session as session:
+        pool = Go2RtcWsPool(session, str(server.server.make_url("/")))
+        await server.server.close()
+        with pytest.raises(Go2RtcClientError):
+            await pool.acquire(source="camera")
+
+        assert pool.active == 0
+
+
+async def test_acquire_closed_pool(pool: Go2RtcWsPool) -> None:
+    """Test acquiring from a closed pool raises."""
+    await pool.close()
+    with pytest.raises(RuntimeError, match="Pool is closed"):
+        await pool.acquire(source="camera")
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        (
+            {"source": "source", "destination": "destination"},
+            "Source and destination cannot be set at the same time",
+        ),
+        ({}, "Source or destination must be set"),
+    ],
+)
+async def test_acquire_invalid_params(
+    pool: Go2RtcWsPool, kwargs: dict[str, str], message: str
+) -> None:
+    """Test source or destination must be set."""
+    with pytest.raises(ValueError, match=message):
+        await pool.acquire(**kwargs)
+
+
+async def test_invalid_max_connections(server: TestServer) -> None:
+    """Test max connections must be at least 1."""
+    async with TestClient(server.server).session as session:
+        with pytest.raises(ValueError, match="Max connections must be at least 1"):
+            Go2RtcWsPool(session, "http://localhost", max_connections=0)